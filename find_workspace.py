@@ -6,6 +6,7 @@ Useful for getting UUIDs to use with set_workspace_extension.py.
 
 import argparse
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 import utils
 
@@ -25,6 +26,9 @@ Examples:
 
   # Search without SSL verification
   uv run python find_workspace.py --name "CMS" --no-verify-ssl
+
+  # Bypass the on-disk API response cache
+  uv run python find_workspace.py --name "CMS" --no-cache
         """
     )
     
@@ -46,6 +50,12 @@ Examples:
         help='Ignore SSL certificate verification errors'
     )
     
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk API response cache (enabled by cache_ttl in config)'
+    )
+    
     # Show help if no arguments provided
     if len(sys.argv) == 1:
         parser.print_help()
@@ -58,20 +68,32 @@ Examples:
     print("Fetching workspaces...")
     
     try:
-        # Get all workspaces
-        response = utils.make_api_request(
-            '/api/workspaces',
-            method='GET',
-            verify_ssl=verify_ssl
-        )
-        
-        workspaces = response.get('items', [])
+        # Let the server filter by name so only candidate workspaces are transferred
+        name_filter = {
+            'type': 'name',
+            'mode': 'contain' if args.partial else 'equal',
+            'text': args.name,
+            'caseSensitive': not args.partial
+        }
+        # The search only returns archived or non-archived workspaces ('archived' is
+        # required and is not a filter), so both sets are fetched concurrently and
+        # listed active first, then archived
+        def search(archived: bool) -> list:
+            return utils.fetch_all_pages(
+                '/api/workspaces/search',
+                data={
+                    'archived': archived,
+                    'sort': {'type': 'name', 'direction': 'asc'},
+                    'filter': name_filter
+                },
+                verify_ssl=verify_ssl,
+                use_cache=not args.no_cache
+            )
         
-        if not workspaces:
-            print("No workspaces found.")
-            sys.exit(0)
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            workspaces = [ws for result in executor.map(search, (False, True)) for ws in result]
         
-        # Search for matching workspaces
+        # Re-check matches locally to keep the exact/partial semantics strict
         search_name = args.name.lower() if args.partial else args.name
         matches = []
         
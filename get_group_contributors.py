@@ -12,29 +12,49 @@ from typing import Dict, List
 
 from utils import (
     load_registries,
-    get_groups_by_prefix,
-    get_groups_matching_pattern,
+    get_groups_matching_patterns,
+    CONTRIBUTOR_GROUP_PATTERNS,
     get_group_by_name,
     get_group_members,
     get_username_from_id,
-    get_user_role,
+    get_users_by_role,
     colorize
 )
 
 
-def list_contributors_in_group(group_name: str, verify_ssl: bool = True) -> Dict[str, List[str]]:
+def get_contributor_names(user_ids: List[str]) -> List[str]:
+    """
+    Filter user IDs down to contributors and resolve their names in a single pass.
+    
+    Args:
+        user_ids: List of user IDs (e.g., members of a group)
+    
+    Returns:
+        Sorted list of contributor full names
+    """
+    # Role index from the registry: one set membership test per user
+    contributor_ids = get_users_by_role('contributor')
+    return sorted(
+        get_username_from_id(user_id)
+        for user_id in user_ids
+        if user_id in contributor_ids
+    )
+
+
+def list_contributors_in_group(group_name: str, verify_ssl: bool = True, use_cache: bool = False) -> Dict[str, List[str]]:
     """
     Find contributors in a specific group.
     
     Args:
         group_name: Name of the group to check
         verify_ssl: Whether to verify SSL certificates (default: True)
+        use_cache: Whether to read API responses through the on-disk cache (default: False)
     
     Returns:
         Dictionary with single entry: group_name -> [contributor_names]
     """
     # Load registries (users and groups)
-    load_registries(verify_ssl=verify_ssl)
+    load_registries(verify_ssl=verify_ssl, use_cache=use_cache)
     
     # Find the specific group
     group = get_group_by_name(group_name)
@@ -44,60 +64,43 @@ def list_contributors_in_group(group_name: str, verify_ssl: bool = True) -> Dict
         sys.exit(1)
     
     # Get members and filter for contributors
-    user_ids = get_group_members(group['id'])
-    contributors = []
-    
-    for user_id in user_ids:
-        role = get_user_role(user_id)
-        if role == 'contributor':
-            full_name = get_username_from_id(user_id)
-            contributors.append(full_name)
+    contributors = get_contributor_names(get_group_members(group['id']))
     
     if contributors:
-        return {group_name: sorted(contributors)}
+        return {group_name: contributors}
     return {}
 
 
-def list_contributors_in_okr_groups(verify_ssl: bool = True) -> Dict[str, List[str]]:
+def list_contributors_in_okr_groups(verify_ssl: bool = True, use_cache: bool = False) -> Dict[str, List[str]]:
     """
     Find all SP_OKR_ and SP_ProdMgt_ groups (excluding *_C_U) and list their members with contributor role.
     
     Args:
         verify_ssl: Whether to verify SSL certificates (default: True)
+        use_cache: Whether to read API responses through the on-disk cache (default: False)
     
     Returns:
         Dictionary mapping group name to list of contributor full names
     """
     # Load registries (users and groups)
-    load_registries(verify_ssl=verify_ssl)
-    
-    # Get all groups starting with SP_OKR_
-    okr_groups = get_groups_by_prefix('SP_OKR_')
-    
-    # Get all groups starting with SP_ProdMgt_ but NOT ending with _C_U
-    prodmgt_groups = get_groups_matching_pattern('SP_ProdMgt_', exclude_suffix='_C_U')
+    load_registries(verify_ssl=verify_ssl, use_cache=use_cache)
     
-    # Combine both lists
-    all_groups = okr_groups + prodmgt_groups
+    # Get all groups starting with SP_OKR_, and those starting with SP_ProdMgt_
+    # but NOT ending with _C_U, in a single pass over the group registry
+    all_groups = get_groups_matching_patterns(CONTRIBUTOR_GROUP_PATTERNS)
     
     # Dictionary to store results: group_name -> [contributor_names]
     contributors_by_group = {}
     
     for group in all_groups:
         group_name = group.get('name', 'Unknown Group')
-        user_ids = group.get('userIds', [])
         
         # Find contributors in this group
-        contributors = []
-        for user_id in user_ids:
-            role = get_user_role(user_id)
-            if role == 'contributor':
-                full_name = get_username_from_id(user_id)
-                contributors.append(full_name)
+        contributors = get_contributor_names(group.get('userIds', []))
         
         # Only add groups that have contributors
         if contributors:
-            contributors_by_group[group_name] = sorted(contributors)
+            contributors_by_group[group_name] = contributors
     
     return contributors_by_group
 
@@ -117,11 +120,13 @@ def display_contributors(contributors_by_group: Dict[str, List[str]], group_name
             print("No contributors found in SP_OKR_ or SP_ProdMgt_ groups.")
         return
     
-    # Sort groups by name for consistent display
+    # Sort groups by name for consistent display; collect the lines and
+    # write them in a single call instead of one print() per contributor
+    out = []
     for grp_name in sorted(contributors_by_group.keys()):
-        print(f"\n{grp_name}:")
-        for contributor in contributors_by_group[grp_name]:
-            print(f"  - {contributor}")
+        out.append(f"\n{grp_name}:")
+        out.extend(f"  - {contributor}" for contributor in contributors_by_group[grp_name])
+    sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -139,20 +144,26 @@ def main():
         action='store_true',
         help='Disable SSL certificate verification'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk API response cache (enabled by cache_ttl in config)'
+    )
     
     args = parser.parse_args()
     verify_ssl = not args.no_verify_ssl
+    use_cache = not args.no_cache
     
     try:
         if args.group_name:
             # List contributors for specific group
             print(f"Fetching contributors for group: {args.group_name}")
-            contributors = list_contributors_in_group(args.group_name, verify_ssl=verify_ssl)
+            contributors = list_contributors_in_group(args.group_name, verify_ssl=verify_ssl, use_cache=use_cache)
             display_contributors(contributors, group_name=args.group_name)
         else:
             # List contributors for all SP_OKR_ and SP_ProdMgt_ groups
             print("Fetching contributors for all SP_OKR_ and SP_ProdMgt_ groups except those ending with '_C_U'...")
-            contributors = list_contributors_in_okr_groups(verify_ssl=verify_ssl)
+            contributors = list_contributors_in_okr_groups(verify_ssl=verify_ssl, use_cache=use_cache)
             display_contributors(contributors)
     except Exception as e:
         print(f"\nError: {e}", file=sys.stderr)
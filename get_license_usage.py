@@ -12,54 +12,92 @@ Provides a breakdown of:
 """
 
 import argparse
+import cmd
 import sys
-from typing import Dict, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Set
 
 from utils import (
     load_registries,
     get_team_info,
-    get_unique_members_by_prefix,
+    classify_group_members,
     get_users_not_in_groups,
-    get_users_not_in_specific_groups,
-    get_username_from_id,
-    colorize
+    get_users_by_role,
+    user_ids_to_mask,
+    get_usernames_bulk,
+    get_all_workspaces,
+    reset_registries,
+    colorize,
+    get_indent
 )
 
 
-def analyze_license_usage(verify_ssl: bool = True, debug: bool = False) -> Dict[str, any]:
+def analyze_license_usage(
+    verify_ssl: bool = True,
+    debug: bool = False,
+    use_cache: bool = False,
+    need_orphan_set: bool = True,
+    refresh: bool = False
+) -> Dict[str, any]:
     """
     Analyze license usage across OKR and Product Management groups.
     
     Args:
         verify_ssl: Whether to verify SSL certificates (default: True)
         debug: Enable debug output (default: False)
+        use_cache: Whether to read API responses through the on-disk cache (default: False)
+        need_orphan_set: Whether to return the set of editors not in groups; when False
+                         only their count is computed and 'editors_not_in_groups' is None
+        refresh: Whether to reload registries and team info from the API, bypassing
+                 in-memory data and on-disk cached entries (default: False)
     
     Returns:
         Dictionary containing license analysis data
     """
-    # Load registries (users and groups)
-    load_registries(verify_ssl=verify_ssl)
-    
-    # Get team info with license seat data
-    team_info = get_team_info(verify_ssl=verify_ssl)
+    # Load registries (users and groups) and team info with license seat data
+    # concurrently - the requests are independent
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        registries_future = executor.submit(
+            load_registries, verify_ssl=verify_ssl, use_cache=use_cache, refresh=refresh
+        )
+        team_info_future = executor.submit(
+            get_team_info, verify_ssl=verify_ssl, use_cache=use_cache, refresh=refresh
+        )
+        registries_future.result()
+        team_info = team_info_future.result()
     seats = team_info.get('state', {}).get('seats', {}).get('any', {})
     
-    # Get unique members for OKR groups (SP_OKR_*)
-    okr_users = get_unique_members_by_prefix('SP_OKR_')
+    # Classify group members in a single pass over the group registry:
+    # - okr: SP_OKR_* groups
+    # - prodmgt: SP_ProdMgt_* groups (excluding *_C_U)
+    # - okr_licensed: SP_OKR_* groups (excluding *_C_U), used for the editors check
+    members = classify_group_members({
+        'okr': ('SP_OKR_', None),
+        'prodmgt': ('SP_ProdMgt_', '_C_U'),
+        'okr_licensed': ('SP_OKR_', '_C_U'),
+    })
+    okr_users = members['okr']
+    prodmgt_users = members['prodmgt']
+    users_in_licensed_groups = members['okr_licensed'] | prodmgt_users
     
-    # Get unique members for Product Management groups (SP_ProdMgt_* but NOT *_C_U)
-    prodmgt_users = get_unique_members_by_prefix('SP_ProdMgt_', exclude_suffix='_C_U')
+    # Cohort set algebra on integer bitmasks (one bit per user)
+    okr_mask = user_ids_to_mask(okr_users)
+    prodmgt_mask = user_ids_to_mask(prodmgt_users)
     
     # Get editors who are not in SP_OKR_ or SP_ProdMgt_ groups (excluding *_C_U)
-    editors_not_in_groups = get_users_not_in_specific_groups(
-        prefixes=['SP_OKR_', 'SP_ProdMgt_'],
-        exclude_suffix='_C_U',
-        role='editor'
-    )
+    if need_orphan_set:
+        editors_not_in_groups = get_users_by_role('editor') - users_in_licensed_groups
+        editors_mask = user_ids_to_mask(editors_not_in_groups)
+    else:
+        editors_not_in_groups = None
+        editors_mask = (
+            user_ids_to_mask(get_users_by_role('editor'))
+            & ~user_ids_to_mask(users_in_licensed_groups)
+        )
+    editors_not_in_groups_count = editors_mask.bit_count()
     
     # Count administrators (users with 'admin' role)
-    from utils import _user_registry
-    admin_count = sum(1 for user in _user_registry.values() if user.get('role') == 'admin')
+    admin_count = len(get_users_by_role('admin'))
     
     # Debug output
     if debug:
@@ -69,12 +107,11 @@ def analyze_license_usage(verify_ssl: bool = True, debug: bool = False) -> Dict[
         
         # Count users by role
         role_counts = {}
-        users_in_any_group = set()
+        users_in_any_group = set().union(
+            *(group.get('userIds', []) for group in _group_registry.values())
+        )
         users_in_okr_or_prodmgt = okr_users.union(prodmgt_users)
         
-        for group in _group_registry.values():
-            users_in_any_group.update(group.get('userIds', []))
-        
         for user_id, user in _user_registry.items():
             role = user.get('role', 'unknown')
             role_counts[role] = role_counts.get(role, 0) + 1
@@ -85,19 +122,19 @@ def analyze_license_usage(verify_ssl: bool = True, debug: bool = False) -> Dict[
         print(f"Users by role: {role_counts}")
         print(f"Total users in at least one group: {len(users_in_any_group)}")
         print(f"Total users in SP_OKR_ or SP_ProdMgt_ groups: {len(users_in_okr_or_prodmgt)}")
-        print(f"Editors not in SP_OKR_/SP_ProdMgt_ groups: {len(editors_not_in_groups)}")
+        print(f"Editors not in SP_OKR_/SP_ProdMgt_ groups: {editors_not_in_groups_count}")
         print()
     
     # Find users who are in both OKR and ProdMgt (shared licenses)
-    shared_users = okr_users.intersection(prodmgt_users)
+    shared_mask = okr_mask & prodmgt_mask
     
     # Calculate OKR only users (OKR users minus those in both)
-    okr_only_users = okr_users - prodmgt_users
+    okr_only_mask = okr_mask & ~prodmgt_mask
     
     # Calculate effective license users (unique across all categories)
     # Editors not in groups are already separate, so we add them
     # Add admins to the calculation
-    effective_users = okr_users.union(prodmgt_users).union(editors_not_in_groups)
+    effective_mask = okr_mask | prodmgt_mask | editors_mask
     # Note: effective_users already includes admins if they're in OKR/ProdMgt groups or are editors not in groups
     # We need to add admin count separately as they may not be in any of these categories
     
@@ -106,11 +143,11 @@ def analyze_license_usage(verify_ssl: bool = True, debug: bool = False) -> Dict[
         'admin_count': admin_count,
         'okr_count': len(okr_users),
         'prodmgt_count': len(prodmgt_users),
-        'editors_not_in_groups_count': len(editors_not_in_groups),
-        'editors_not_in_groups': editors_not_in_groups,  # Return the actual set
-        'shared_count': len(shared_users),
-        'okr_only_count': len(okr_only_users),
-        'effective_count': len(effective_users) + admin_count  # Add admins to effective count
+        'editors_not_in_groups_count': editors_not_in_groups_count,
+        'editors_not_in_groups': editors_not_in_groups,  # Actual set, or None if not requested
+        'shared_count': shared_mask.bit_count(),
+        'okr_only_count': okr_only_mask.bit_count(),
+        'effective_count': effective_mask.bit_count() + admin_count  # Add admins to effective count
     }
 
 
@@ -155,7 +192,11 @@ def display_license_summary(analysis: Dict[str, any]):
     print()
 
 
-def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True):
+def display_orphaned_editors(
+    editors_not_in_groups: set,
+    verify_ssl: bool = True,
+    access_data: Optional[dict] = None
+):
     """
     Display a list of editors who are not in SP_OKR_ or SP_ProdMgt_ groups,
     including hierarchical view of workspace groups (folders) and workspaces they have access to.
@@ -163,6 +204,7 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
     Args:
         editors_not_in_groups: Set of user IDs for editors not in OKR/ProdMgt groups
         verify_ssl: Whether to verify SSL certificates (default: True)
+        access_data: Optional result of build_user_access_mappings() to reuse (default: build it)
     """
     if not editors_not_in_groups:
         print(colorize("\nNo orphaned editors found.", 'green'))
@@ -173,36 +215,86 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
     print(colorize(f"\n=== Orphaned Editors (Not in SP_OKR_/SP_ProdMgt_): {len(editors_not_in_groups)} ===\n", 'yellow'))
     
     # Use shared function to build access mappings (performance optimized, no duplication!)
-    access_data = build_user_access_mappings(verify_ssl=verify_ssl)
+    if access_data is None:
+        access_data = build_user_access_mappings(verify_ssl=verify_ssl)
     user_to_workspaces = access_data['user_to_workspaces']
     user_to_folders = access_data['user_to_folders']
     full_hierarchy = access_data['full_hierarchy']
     
-    # Sort by username for consistent output
-    editor_list = sorted([
-        (get_username_from_id(user_id), user_id) 
-        for user_id in editors_not_in_groups
-    ])
+    # Invert the access mappings once for the editors being displayed
+    folder_users = {}
+    workspace_users = {}
+    for user_id in editors_not_in_groups:
+        for folder in user_to_folders.get(user_id, []):
+            folder_users.setdefault(folder['id'], set()).add(user_id)
+        for workspace in user_to_workspaces.get(user_id, []):
+            workspace_users.setdefault(workspace['id'], set()).add(user_id)
+    
+    # Precompute bottom-up which editors can access anything in each subtree,
+    # so the per-editor rendering below never re-walks inaccessible branches
+    # The same pass hoists each folder's and workspace's user permissions
+    subtree_users = {}
+    folder_perms = {}
+    ws_perms = {}
+    
+    def collect_subtree_users(node: dict) -> set:
+        """Return (and record) the editors with access to node or its descendants."""
+        if node.get('is_folder'):
+            folder_data = node.get('folder_data', {})
+            folder_id = folder_data.get('id')
+            folder_perms[folder_id] = folder_data.get('_embedded', {}).get('permissions', {})
+            users = set(folder_users.get(folder_id, ()))
+            for ws_node in node.get('workspaces', []):
+                workspace = ws_node['workspace']
+                ws_perms[workspace['id']] = workspace.get('_embedded', {}).get('permissions', {})
+                users |= workspace_users.get(workspace['id'], set())
+            for child in node.get('children', []):
+                users |= collect_subtree_users(child)
+        else:
+            workspace = node['workspace']
+            ws_perms[workspace['id']] = workspace.get('_embedded', {}).get('permissions', {})
+            users = workspace_users.get(workspace['id'], set())
+        subtree_users[id(node)] = users
+        return users
+    
+    for root in full_hierarchy['roots']:
+        collect_subtree_users(root)
     
-    for name, user_id in editor_list:
-        print(f"  - {name}")
+    # Display label for every permission value seen in the hierarchy
+    permission_labels = {
+        permission: permission.capitalize()
+        for perms in (*folder_perms.values(), *ws_perms.values())
+        for permission in perms.values()
+        if permission
+    }
+    permission_labels[''] = 'Unknown'
+    
+    # Sort by username (case-insensitive) for consistent output
+    editor_names = get_usernames_bulk(editors_not_in_groups)
+    editor_list = sorted(
+        editor_names.items(), key=lambda item: (item[1].casefold(), item[0])
+    )
+    
+    lines = []
+    for user_id, name in editor_list:
+        lines.append(f"  - {name}")
         
         # Get user's workspaces and folders from pre-built mappings (no API calls!)
         user_workspaces = user_to_workspaces.get(user_id, [])
         user_workspace_groups = user_to_folders.get(user_id, [])
         
         if not user_workspace_groups and not user_workspaces:
-            print(f"    {colorize('No workspace or folder access', 'magenta')}")
+            lines.append(f"    {colorize('No workspace or folder access', 'magenta')}")
             continue
         
-        print(f"    {colorize('Access hierarchy:', 'cyan')}")
+        lines.append(f"    {colorize('Access hierarchy:', 'cyan')}")
         
         # Filter hierarchy to only show folders/workspaces user has access to
         user_folder_ids = {f['id'] for f in user_workspace_groups}
         user_workspace_ids = {ws['id'] for ws in user_workspaces}
         
         def print_user_hierarchy(node: dict, depth: int = 2):
-            """Print hierarchy showing only items the user has access to."""
+            """Append hierarchy lines showing only items the user has access to."""
             if node.get('is_folder'):
                 folder_data = node.get('folder_data', {})
                 folder_id = folder_data.get('id')
@@ -211,14 +303,11 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
                 # Check if user has access to this folder
                 if folder_id in user_folder_ids:
                     # Get folder permission
-                    embedded = folder_data.get('_embedded', {})
-                    user_permissions = embedded.get('permissions', {})
-                    permission = user_permissions.get(user_id, '')
-                    perm_display = permission.capitalize() if permission else 'Unknown'
+                    perm_display = permission_labels[folder_perms[folder_id].get(user_id, '')]
                     
                     # Display folder
-                    indent = ".." * depth
-                    print(f"      {indent}📁 {folder_name} ({perm_display})")
+                    indent = get_indent(depth)
+                    lines.append(f"      {indent}📁 {folder_name} ({perm_display})")
                     
                     # Show workspaces in this folder that user has access to
                     for ws_node in node.get('workspaces', []):
@@ -226,13 +315,10 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
                         ws_id = workspace['id']
                         if ws_id in user_workspace_ids:
                             ws_name = workspace.get('name', 'Unnamed')
-                            ws_embedded = workspace.get('_embedded', {})
-                            ws_user_permissions = ws_embedded.get('permissions', {})
-                            ws_permission = ws_user_permissions.get(user_id, '')
-                            ws_perm_display = ws_permission.capitalize() if ws_permission else 'Unknown'
+                            ws_perm_display = permission_labels[ws_perms[ws_id].get(user_id, '')]
                             
-                            ws_indent = ".." * (depth + 1)
-                            print(f"      {ws_indent}{ws_name} ({ws_perm_display})")
+                            ws_indent = get_indent(depth + 1)
+                            lines.append(f"      {ws_indent}{ws_name} ({ws_perm_display})")
                     
                     # Recursively show subfolders
                     for child_folder in node.get('children', []):
@@ -257,8 +343,8 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
                     
                     if has_accessible_content:
                         # Show folder name without permission to maintain hierarchy
-                        indent = ".." * depth
-                        print(f"      {indent}📁 {folder_name}")
+                        indent = get_indent(depth)
+                        lines.append(f"      {indent}📁 {folder_name}")
                         
                         # Show workspaces
                         for ws_node in node.get('workspaces', []):
@@ -266,13 +352,10 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
                             ws_id = workspace['id']
                             if ws_id in user_workspace_ids:
                                 ws_name = workspace.get('name', 'Unnamed')
-                                ws_embedded = workspace.get('_embedded', {})
-                                ws_user_permissions = ws_embedded.get('permissions', {})
-                                ws_permission = ws_user_permissions.get(user_id, '')
-                                ws_perm_display = ws_permission.capitalize() if ws_permission else 'Unknown'
+                                ws_perm_display = permission_labels[ws_perms[ws_id].get(user_id, '')]
                                 
-                                ws_indent = ".." * (depth + 1)
-                                print(f"      {ws_indent}{ws_name} ({ws_perm_display})")
+                                ws_indent = get_indent(depth + 1)
+                                lines.append(f"      {ws_indent}{ws_name} ({ws_perm_display})")
                         
                         # Show subfolders
                         for child_folder in node.get('children', []):
@@ -283,42 +366,115 @@ def display_orphaned_editors(editors_not_in_groups: set, verify_ssl: bool = True
                 ws_id = workspace['id']
                 if ws_id in user_workspace_ids:
                     ws_name = workspace.get('name', 'Unnamed')
-                    ws_embedded = workspace.get('_embedded', {})
-                    ws_user_permissions = ws_embedded.get('permissions', {})
-                    ws_permission = ws_user_permissions.get(user_id, '')
-                    ws_perm_display = ws_permission.capitalize() if ws_permission else 'Unknown'
+                    ws_perm_display = permission_labels[ws_perms[ws_id].get(user_id, '')]
                     
-                    indent = ".." * depth
-                    print(f"      {indent}{ws_name} ({ws_perm_display})")
+                    indent = get_indent(depth)
+                    lines.append(f"      {indent}{ws_name} ({ws_perm_display})")
         
         def has_accessible_items_in_tree(node: dict) -> bool:
-            """Check if node or descendants have accessible items."""
-            if node.get('is_folder'):
-                folder_id = node.get('folder_data', {}).get('id')
-                if folder_id in user_folder_ids:
-                    return True
-                
-                for ws_node in node.get('workspaces', []):
-                    if ws_node['workspace']['id'] in user_workspace_ids:
-                        return True
-                
-                for child in node.get('children', []):
-                    if has_accessible_items_in_tree(child):
-                        return True
-            else:
-                if node['workspace']['id'] in user_workspace_ids:
-                    return True
-            
-            return False
+            """Check if node or descendants have accessible items (precomputed)."""
+            return user_id in subtree_users.get(id(node), ())
         
         # Print the hierarchy
         for root in full_hierarchy['roots']:
             if has_accessible_items_in_tree(root):
                 print_user_hierarchy(root)
     
+    # Write the whole report at once instead of one print() per line
+    sys.stdout.write("\n".join(lines) + "\n")
     print()
 
 
+class LicenseShell(cmd.Cmd):
+    """
+    Interactive session that keeps registries and access mappings in memory,
+    so repeated queries do not re-fetch users, groups and workspaces.
+    """
+    
+    intro = "License usage shell. Type 'help' for commands, 'quit' to exit."
+    prompt = "license> "
+    
+    def __init__(self, verify_ssl: bool = True, use_cache: bool = False):
+        super().__init__()
+        self.verify_ssl = verify_ssl
+        self.use_cache = use_cache
+        self.access_data = None
+        # Set by 'refresh': the next analysis bypasses the on-disk cache too
+        self.refresh_pending = False
+    
+    def _analyze(self, need_orphan_set: bool) -> Dict[str, any]:
+        analysis = analyze_license_usage(
+            verify_ssl=self.verify_ssl,
+            use_cache=self.use_cache,
+            need_orphan_set=need_orphan_set,
+            refresh=self.refresh_pending
+        )
+        self.refresh_pending = False
+        return analysis
+    
+    def onecmd(self, line: str) -> bool:
+        # Keep the session alive when a single command fails
+        try:
+            return super().onecmd(line)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return False
+    
+    def emptyline(self) -> bool:
+        return False
+    
+    def do_summary(self, arg: str):
+        """summary: Show the license usage summary."""
+        display_license_summary(self._analyze(need_orphan_set=False))
+    
+    def do_orphans(self, arg: str):
+        """orphans: List editors not in SP_OKR_/SP_ProdMgt_ groups with their access hierarchy."""
+        from utils import build_user_access_mappings
+        
+        analysis = self._analyze(need_orphan_set=True)
+        if analysis['editors_not_in_groups'] and self.access_data is None:
+            self.access_data = build_user_access_mappings(verify_ssl=self.verify_ssl)
+        display_orphaned_editors(
+            analysis['editors_not_in_groups'],
+            verify_ssl=self.verify_ssl,
+            access_data=self.access_data
+        )
+    
+    def do_find(self, arg: str):
+        """find <text>: List workspaces whose name contains <text> (case-insensitive)."""
+        search_name = arg.strip().lower()
+        if not search_name:
+            print("Usage: find <text>")
+            return
+        
+        matches = sorted(
+            (ws for ws in get_all_workspaces(verify_ssl=self.verify_ssl)
+             if search_name in ws.get('name', '').lower()),
+            key=lambda ws: ws.get('name', '').casefold()
+        )
+        if not matches:
+            print(f"No workspaces found matching '{arg.strip()}'")
+            return
+        # Names only - IDs are never displayed (see Instructions.txt)
+        for ws in matches:
+            status = " [ARCHIVED]" if ws.get('archived', False) else ""
+            print(f"  {ws.get('name', 'N/A')}{status}")
+    
+    def do_refresh(self, arg: str):
+        """refresh: Discard in-memory data and fetch everything again on the next command."""
+        reset_registries()
+        self.access_data = None
+        self.refresh_pending = True
+        print("Registries cleared; data will be re-fetched from the API on the next command.")
+    
+    def do_quit(self, arg: str) -> bool:
+        """quit: Exit the shell."""
+        return True
+    
+    do_exit = do_quit
+    do_EOF = do_quit
+
+
 def main():
     """Main entry point."""
     parser = argparse.ArgumentParser(
@@ -339,17 +495,36 @@ def main():
         action='store_true',
         help='Disable SSL certificate verification'
     )
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Bypass the on-disk API response cache (enabled by cache_ttl in config)'
+    )
+    parser.add_argument(
+        '--interactive',
+        action='store_true',
+        help='Start an interactive shell that keeps data in memory between queries'
+    )
     
     args = parser.parse_args()
     verify_ssl = not args.no_verify_ssl
     
+    if args.interactive:
+        LicenseShell(verify_ssl=verify_ssl, use_cache=not args.no_cache).cmdloop()
+        return
+    
     try:
-        analysis = analyze_license_usage(verify_ssl=verify_ssl, debug=args.debug)
+        analysis = analyze_license_usage(
+            verify_ssl=verify_ssl,
+            debug=args.debug,
+            use_cache=not args.no_cache,
+            need_orphan_set=args.orphaned_editors
+        )
         display_license_summary(analysis)
         
         # If --orphaned-editors flag is set, display the list with workspace access
         if args.orphaned_editors:
-            editors_not_in_groups = analysis.get('editors_not_in_groups', set())
+            editors_not_in_groups = analysis.get('editors_not_in_groups') or set()
             display_orphaned_editors(editors_not_in_groups, verify_ssl=verify_ssl)
             
     except Exception as e:
@@ -7,23 +7,57 @@ and validates their access permissions against defined rules.
 """
 
 import argparse
+import functools
 import sys
-from typing import Any, Dict, List, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
 from utils import (
     load_registries,
     make_api_request,
-    get_username_from_id,
-    get_usergroup_name,
+    get_usernames_bulk,
+    get_usergroup_names_bulk,
     get_current_user_id,
     format_permission,
+    is_group_permission_wrong,
     build_workspace_hierarchy,
-    colorize,
+    get_indent,
     is_okr_workspace,
     get_all_workspaces,
+    ANSI_COLOR_CODES,
     WORKSPACE_COLOR_MAPPING,
+    format_wrong,
 )
 
+# Valid workspace colors for OKR workspaces (frozenset for O(1) membership tests)
+VALID_COLORS = frozenset({"yellow", "orange", "great", "blue", "purple"})
+
+# Groups must start with this prefix (or be the admin group)
+VALID_GROUP_PREFIX = "SP_OKR_"
+
+# Required permission per group name suffix (e.g. _F groups must have Full access)
+GROUP_SUFFIX_PERMISSIONS = {"_F": "full", "_W": "write"}
+
+
+@functools.lru_cache(maxsize=None)
+def is_wrong_group(group_name: str, permission: str) -> bool:
+    """
+    Check a group permission against the OKR group rules:
+    groups must start with SP_OKR_ OR be "Airfocus Admins", and groups
+    ending with _F / _W must have Full / Write access.
+    Results are memoized, as the same (group, permission) pairs repeat across workspaces.
+
+    Args:
+        group_name: Name of the user group
+        permission: Permission the group has on the workspace
+
+    Returns:
+        True if the group permission should be flagged as (Wrong)
+    """
+    return is_group_permission_wrong(
+        group_name, permission, VALID_GROUP_PREFIX, GROUP_SUFFIX_PERMISSIONS
+    )
+
 
 def format_workspace_access(
     workspace: Dict[str, Any],
@@ -43,30 +77,32 @@ def format_workspace_access(
     Returns:
         Tuple of (list of formatted lines, has_red_flag boolean)
     """
-    lines = []
+    # Slot 0 is reserved for the name line, which is only final once all flags are known
+    lines = [None]
+    # Bound once: lines are appended in the per-user/per-group loops below
+    add_line = lines.append
     has_red_flag = False
 
-    # Check if workspace has user permissions (excluding current user)
+    # Check if workspace has user permissions (excluding current user) in constant time:
+    # more entries than the current user's own (bool counts as 0 or 1)
     embedded = workspace.get("_embedded", {})
     user_permissions = embedded.get("permissions", {})
-    has_user_access = any(uid != current_user_id for uid in user_permissions.keys())
+    has_user_access = len(user_permissions) > (current_user_id in user_permissions)
 
     # Build prefix using '..' for each depth level
-    prefix = ".." * depth
+    prefix = get_indent(depth)
 
     # Workspace name
     ws_name = workspace.get("name", "Unnamed")
     item_key = workspace.get("alias", "")
     item_color = workspace.get("itemColor", "")
 
-    # Determine workspace color for all its properties
-    workspace_color = None
     if has_user_access:
         has_red_flag = True
 
-    # Map item colors to terminal colors
-    if item_color and item_color in WORKSPACE_COLOR_MAPPING:
-        workspace_color = WORKSPACE_COLOR_MAPPING[item_color]
+    # Determine workspace color for all its properties: map item colors to
+    # terminal colors (None for empty or unmapped colors)
+    workspace_color = WORKSPACE_COLOR_MAPPING.get(item_color)
 
     # We'll determine if workspace has errors later and append (Wrong) to workspace name if needed
     # For now, just store the workspace name line - we'll finalize it after checking all rules
@@ -77,250 +113,291 @@ def format_workspace_access(
     default_permission = workspace.get("defaultPermission")
 
     # Detail indent: ALL lines have dots - add one more level of dots for details
-    detail_indent = ".." * (depth + 1)
+    detail_indent = get_indent(depth + 1)
+
+    # ANSI codes are looked up once per workspace; valid lines are then wrapped
+    # with a plain f-string instead of one colorize() call per line
+    reset_code = ANSI_COLOR_CODES["reset"]
+    color_code = ANSI_COLOR_CODES.get(workspace_color, "") if workspace_color else ""
+
+    def paint(line: str) -> str:
+        # Same result as colorize(line, workspace_color)
+        return f"{color_code}{line}{reset_code}" if color_code else line
+
+    # Each rule is evaluated on the raw fields first; a line is only built
+    # (formatted and colorized) when it will actually be shown
 
     # First: Color - If invalid color, entire line in RED. Otherwise workspace color.
-    valid_colors = ["yellow", "orange", "great", "blue", "purple"]
-    color_line = f"{detail_indent}Color: {item_color if item_color else '(empty)'}"
-    is_red = not item_color or item_color not in valid_colors
+    # (empty or missing colors are not in the frozenset either)
+    is_red = item_color not in VALID_COLORS
     if is_red:
-        # Invalid color - entire line in RED including (Wrong)
-        color_line = colorize(f"{color_line} (Wrong)", "red")
         has_red_flag = True
-    elif workspace_color:
-        # Valid color - show in workspace color
-        color_line = colorize(color_line, workspace_color)
-
     if show_all or is_red:
-        lines.append(color_line)
+        color_line = f"{detail_indent}Color: {item_color if item_color else '(empty)'}"
+        if is_red:
+            # Invalid color - entire line in RED including (Wrong)
+            color_line = format_wrong(color_line)
+        elif workspace_color:
+            # Valid color - show in workspace color
+            color_line = paint(color_line)
+        add_line(color_line)
 
     # Second: Item Key - Show in workspace color, append (Wrong) in RED if invalid
-    key_line = f"{detail_indent}Item Key: {item_key if item_key else '(empty)'}"
     is_red = not item_key or not item_key.startswith("OKR")
     if is_red:
-        # Show line in workspace color, then append (Wrong) in RED
-        if workspace_color:
-            key_line = colorize(key_line, workspace_color) + colorize(" (Wrong)", "red")
-        else:
-            key_line = colorize(f"{key_line} (Wrong)", "red")
         has_red_flag = True
-    elif workspace_color:
-        key_line = colorize(key_line, workspace_color)
-
     if show_all or is_red:
-        lines.append(key_line)
+        key_line = f"{detail_indent}Item Key: {item_key if item_key else '(empty)'}"
+        if is_red:
+            # Show line in workspace color, then append (Wrong) in RED
+            key_line = format_wrong(key_line, workspace_color)
+        elif workspace_color:
+            key_line = paint(key_line)
+        add_line(key_line)
 
     # Third: Access Rights - Show in workspace color, append (Wrong) in RED if not 'comment'
     if default_permission:
-        perm_display = format_permission(default_permission)
-        default_line = f"{detail_indent}Default: {perm_display}"
         is_red = default_permission != "comment"
         if is_red:
-            # Show line in workspace color, then append (Wrong) in RED
-            if workspace_color:
-                default_line = colorize(default_line, workspace_color) + colorize(
-                    " (Wrong)", "red"
-                )
-            else:
-                default_line = colorize(f"{default_line} (Wrong)", "red")
             has_red_flag = True
-        elif workspace_color:
-            default_line = colorize(default_line, workspace_color)
-
         if show_all or is_red:
-            lines.append(default_line)
-
-    # Add user permissions first (excluding current user)
-    user_perms_filtered = {
-        uid: perm for uid, perm in user_permissions.items() if uid != current_user_id
-    }
+            perm_display = format_permission(default_permission)
+            default_line = f"{detail_indent}Default: {perm_display}"
+            if is_red:
+                # Show line in workspace color, then append (Wrong) in RED
+                default_line = format_wrong(default_line, workspace_color)
+            elif workspace_color:
+                default_line = paint(default_line)
+            add_line(default_line)
 
-    if user_perms_filtered:
+    # Add user permissions first (excluding current user): has_user_access already
+    # tells whether anyone else is listed, so the current user is skipped inline
+    if has_user_access:
         # Always show users section when there are users (it's a RED flag issue)
         users_header = f"{detail_indent}Users:"
         if workspace_color:
-            users_header = colorize(users_header, workspace_color)
-        lines.append(users_header)
+            users_header = paint(users_header)
+        add_line(users_header)
         # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for user_id, permission in sorted(user_perms_filtered.items()):
-            user_name = get_username_from_id(user_id)
+        sub_indent = get_indent(depth + 2)
+        user_names = get_usernames_bulk(user_permissions)
+        for user_id, permission in user_permissions.items():
+            if user_id == current_user_id:
+                continue
+            user_name = user_names[user_id]
             perm_str = format_permission(permission)
             # Users in workspaces - show in workspace color, append (Wrong) in RED
             user_line = f"{sub_indent}{user_name}: {perm_str}"
-            if workspace_color:
-                user_line = colorize(user_line, workspace_color) + colorize(
-                    " (Wrong)", "red"
-                )
-            else:
-                user_line = colorize(f"{user_line} (Wrong)", "red")
-            lines.append(user_line)
+            user_line = format_wrong(user_line, workspace_color)
+            add_line(user_line)
 
     # Add group permissions after users
     if group_permissions:
-        if show_all:
-            groups_header = f"{detail_indent}Groups:"
-            if workspace_color:
-                groups_header = colorize(groups_header, workspace_color)
-            lines.append(groups_header)
+        # With show_all the header is always shown; otherwise only before the first RED group
+        groups_header_emitted = False
 
         # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for group_id, permission in sorted(group_permissions.items()):
-            group_name = get_usergroup_name(group_id)
-            perm_str = format_permission(permission)
+        sub_indent = get_indent(depth + 2)
+        group_names = get_usergroup_names_bulk(group_permissions)
+        for group_id, permission in group_permissions.items():
+            group_name = group_names[group_id]
 
             # Check if group name/permission mismatch - show in workspace color + (Wrong) in RED
-            highlight = False
-
-            # Groups must start with SP_OKR_ OR be "Airfocus Admins"
-            if not group_name.startswith("SP_OKR_") and group_name != "Airfocus Admins":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _F should have Full access
-            elif group_name.endswith("_F") and permission != "full":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _W should have Write access
-            elif group_name.endswith("_W") and permission != "write":
-                highlight = True
+            highlight = is_wrong_group(group_name, permission)
+            if highlight:
                 has_red_flag = True
 
+            if not (show_all or highlight):
+                continue
+
+            if not groups_header_emitted:
+                # Add Groups header before the first group line shown
+                groups_header = f"{detail_indent}Groups:"
+                if workspace_color:
+                    groups_header = paint(groups_header)
+                add_line(groups_header)
+                groups_header_emitted = True
+
+            perm_str = format_permission(permission)
             group_line = f"{sub_indent}{group_name}: {perm_str}"
 
             if highlight:
                 # Show line in workspace color, then append (Wrong) in RED
-                if workspace_color:
-                    group_line = colorize(group_line, workspace_color) + colorize(
-                        " (Wrong)", "red"
-                    )
-                else:
-                    group_line = colorize(f"{group_line} (Wrong)", "red")
+                group_line = format_wrong(group_line, workspace_color)
             elif workspace_color:
-                group_line = colorize(group_line, workspace_color)
-
-            if show_all or highlight:
-                if not show_all and highlight:
-                    # Add Groups header only when showing RED group for first time
-                    if f"{detail_indent}Groups:" not in lines:
-                        groups_header = f"{detail_indent}Groups:"
-                        if workspace_color:
-                            groups_header = colorize(groups_header, workspace_color)
-                        lines.append(groups_header)
-                lines.append(group_line)
+                group_line = paint(group_line)
+
+            add_line(group_line)
 
     # Finalize workspace name line: show in workspace color, append (Wrong) in RED if has_red_flag
-    if workspace_color:
-        workspace_name_line = colorize(workspace_name_line, workspace_color)
-        if has_red_flag:
-            workspace_name_line = workspace_name_line + colorize(" (Wrong)", "red")
-    elif has_red_flag:
-        workspace_name_line = colorize(f"{workspace_name_line} (Wrong)", "red")
+    if has_red_flag:
+        workspace_name_line = format_wrong(workspace_name_line, workspace_color)
+    elif workspace_color:
+        workspace_name_line = paint(workspace_name_line)
 
-    # Prepend workspace name to the beginning of lines
-    lines.insert(0, workspace_name_line)
+    # Fill in the reserved first line (no list shift)
+    lines[0] = workspace_name_line
 
     return lines, has_red_flag
 
 
-def has_errors_in_subtree(
-    node: Dict[str, Any],
-    current_user_id: str,
-    visited: Set[str] = None,
-    _cache: Dict[str, bool] = None,
-) -> bool:
+def workspace_has_red_flag(workspace: Dict[str, Any], current_user_id: str) -> bool:
     """
-    Check if this node or any descendant has validation errors.
-    Uses a cache to avoid re-calling format_workspace_access() for
-    workspaces that have already been checked.
+    Check whether a workspace violates any OKR access rule without building output lines.
+    Applies the same rules as format_workspace_access().
 
     Args:
-        node: Node to check
-        current_user_id: ID of current user
-        visited: Set of visited workspace IDs to detect cycles
-        _cache: Optional cache of workspace_id -> has_red_flag results
+        workspace: Workspace object
+        current_user_id: ID of the current authenticated user
 
     Returns:
-        True if node or any descendant has errors
+        True if the workspace would be flagged as (Wrong)
     """
-    if visited is None:
-        visited = set()
-    if _cache is None:
-        _cache = {}
-
-    ws_id = node["workspace"]["id"]
-    if ws_id in visited:
-        return False
-    visited.add(ws_id)
-
-    # Check if current workspace is OKR and has errors
-    if is_okr_workspace(node["workspace"]):
-        if ws_id in _cache:
-            has_red_flag = _cache[ws_id]
-        else:
-            _, has_red_flag = format_workspace_access(
-                node["workspace"], current_user_id, depth=0, show_all=False
-            )
-            _cache[ws_id] = has_red_flag
-        if has_red_flag:
-            return True
+    embedded = workspace.get("_embedded", {})
+
+    # Direct user access (excluding current user)
+    user_permissions = embedded.get("permissions", {})
+    if len(user_permissions) > (current_user_id in user_permissions):
+        return True
+
+    item_color = workspace.get("itemColor", "")
+    if item_color not in VALID_COLORS:
+        return True
 
-    # Check children recursively
-    for child in node.get("children", []):
-        if has_errors_in_subtree(child, current_user_id, visited, _cache):
+    item_key = workspace.get("alias", "")
+    if not item_key or not item_key.startswith("OKR"):
+        return True
+
+    default_permission = workspace.get("defaultPermission")
+    if default_permission and default_permission != "comment":
+        return True
+
+    group_permissions = embedded.get("userGroupPermissions", {})
+    group_names = get_usergroup_names_bulk(group_permissions)
+    for group_id, permission in group_permissions.items():
+        if is_wrong_group(group_names[group_id], permission):
             return True
 
     return False
 
 
+def compute_subtree_flags(
+    roots: List[Dict[str, Any]], current_user_id: str, check_errors: bool = True
+) -> Dict[str, Dict[str, bool]]:
+    """
+    Compute per-workspace subtree flags in a single iterative post-order pass.
+
+    Args:
+        roots: Root nodes of the workspace hierarchy
+        current_user_id: ID of current user
+        check_errors: If False, only 'has_okr' is filled (enough for --all, which shows
+                      every OKR workspace regardless of errors)
+
+    Returns:
+        Dictionary with:
+        - 'has_okr': workspace_id -> True if the node or any descendant is an OKR workspace
+        - 'has_error': workspace_id -> True if the node or any descendant has validation errors
+        - 'red_flag': workspace_id -> True if the workspace itself has validation errors
+          (only for workspaces that are displayed, i.e. with 'has_okr' set)
+        - 'descendant_error': workspace_id -> True if any child subtree has validation errors
+    """
+    has_okr = {}
+    has_error = {}
+    red_flag = {}
+    descendant_error = {}
+    visited = set()
+
+    # Explicit stack of (node, children_done) avoids deep Python recursion
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, children_done = stack.pop()
+        workspace = node["workspace"]
+        ws_id = workspace["id"]
+        children = node.get("children", [])
+
+        if not children_done:
+            # Detect cycles / shared subtrees
+            if ws_id in visited:
+                continue
+            visited.add(ws_id)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+
+        child_ids = [child["workspace"]["id"] for child in children]
+        is_okr = is_okr_workspace(workspace)
+        has_okr[ws_id] = is_okr or any(has_okr.get(cid, False) for cid in child_ids)
+
+        if not check_errors:
+            continue
+
+        # Evaluate the rules once per displayed workspace; the print pass reuses it
+        if has_okr[ws_id]:
+            red_flag[ws_id] = workspace_has_red_flag(workspace, current_user_id)
+
+        # Children's errors are combined once and reused by the print pass
+        descendant_error[ws_id] = any(has_error.get(cid, False) for cid in child_ids)
+        has_error[ws_id] = (is_okr and red_flag[ws_id]) or descendant_error[ws_id]
+
+    return {
+        "has_okr": has_okr,
+        "has_error": has_error,
+        "red_flag": red_flag,
+        "descendant_error": descendant_error,
+    }
+
+
 def print_okr_hierarchy(
     node: Dict[str, Any],
     current_user_id: str,
     depth: int = 0,
     show_all: bool = False,
     parent_has_error: bool = False,
-    _cache: Dict[str, bool] = None,
+    flags: Dict[str, Dict[str, bool]] = None,
+    out: List[str] = None,
 ):
     """
-    Recursively print OKR workspace hierarchy using '..' for depth levels.
+    Print OKR workspace hierarchy using '..' for depth levels.
+    Traverses depth-first with an explicit stack (same order as a recursive walk)
+    and writes the collected lines to stdout in a single call.
 
     Args:
         node: Node with 'workspace' and 'children'
         current_user_id: ID of the current authenticated user
-        depth: Current depth level in hierarchy
+        depth: Depth level of node in hierarchy
         show_all: If True, show all workspaces; if False, only show workspaces with RED flags
         parent_has_error: If True, parent workspace has errors so we should show this node
-        _cache: Shared cache of workspace_id -> has_red_flag to avoid double formatting
+        flags: Precomputed subtree flags from compute_subtree_flags() (computed if omitted;
+               error flags are only needed when show_all is False)
+        out: Optional list to append output lines to instead of writing them to stdout
     """
-    if _cache is None:
-        _cache = {}
-
-    workspace = node["workspace"]
-    ws_id = workspace["id"]
-
-    # Determine if we should show this workspace
-    should_show_okr = is_okr_workspace(workspace)
-
-    # Check if any children are OKR workspaces (for filtering)
-    has_okr_children = any(
-        is_okr_workspace(child["workspace"]) or has_okr_descendants(child, set())
-        for child in node.get("children", [])
-    )
-
-    # Show this workspace if it's OKR or has OKR descendants
-    if should_show_okr or has_okr_children:
-        lines, has_red_flag = format_workspace_access(
-            workspace, current_user_id, depth, show_all
-        )
-        # Cache the result so has_errors_in_subtree won't re-format this workspace
-        _cache[ws_id] = has_red_flag
-
-        # Check if any descendant has errors (needed for showing parent hierarchy)
-        # Reuses the shared _cache to avoid double-calling format_workspace_access
-        descendant_has_error = any(
-            has_errors_in_subtree(child, current_user_id, set(), _cache)
-            for child in node.get("children", [])
-        )
+    if flags is None:
+        flags = compute_subtree_flags([node], current_user_id, check_errors=not show_all)
+    has_okr = flags["has_okr"]
+    red_flag = flags["red_flag"]
+    descendant_error = flags["descendant_error"]
+
+    write_output = out is None
+    if write_output:
+        out = []
+
+    # Stack of (node, depth, parent_has_error); None marks the empty line
+    # printed after a root-level workspace once its subtree is done
+    stack = [(node, depth, parent_has_error)]
+    while stack:
+        entry = stack.pop()
+        if entry is None:
+            out.append("")
+            continue
+        node, depth, parent_has_error = entry
+
+        workspace = node["workspace"]
+        ws_id = workspace["id"]
+
+        # Show this workspace if it's OKR or has OKR descendants (precomputed per id,
+        # so the workspace dict and its children are not inspected again here)
+        if not has_okr.get(ws_id, False):
+            continue
 
         # Display logic per Instructions.txt line 94:
         # "By default, only display workspaces with (Wrong). Within those workspaces,
@@ -328,70 +405,48 @@ def print_okr_hierarchy(
         # the root (workspace names only, without details)."
         #
         # Implementation:
-        # - If show_all: display everything (--all flag overrides filtering)
+        # - If show_all: display everything (--all flag overrides filtering), so no
+        #   error flags are looked up at all
         # - If has_red_flag: display all lines with (Wrong) for this workspace
         # - If parent_has_error or descendant_has_error: display only workspace name
         #   This ensures the full hierarchy path is visible when any workspace in the
         #   tree has errors, allowing users to see the complete path to problematic workspaces
+        # Workspaces that will not be displayed are never formatted
         if show_all:
-            for line in lines:
-                print(line)
-        elif has_red_flag:
-            # Show only lines with (Wrong) - already filtered by format_workspace_access when show_all=False
-            for line in lines:
-                print(line)
-        elif parent_has_error or descendant_has_error:
-            # Parent or descendant has error, so show just workspace name (first line) to show hierarchy path
-            print(lines[0])
-
-        # Recursively print children - pass down if current or parent has error
-        children = node.get("children", [])
-        for child in children:
-            print_okr_hierarchy(
-                child,
-                current_user_id,
-                depth + 1,
-                show_all,
-                parent_has_error=parent_has_error
-                or has_red_flag
-                or descendant_has_error,
-                _cache=_cache,
-            )
-
-        # Add empty line after root-level workspaces
-        if depth == 0:
-            print()
+            lines, _ = format_workspace_access(workspace, current_user_id, depth, show_all)
+            out.extend(lines)
+            child_has_error = False
+        else:
+            # Red flag from the precompute pass (no need to format just to learn it)
+            has_red_flag = red_flag[ws_id]
 
+            # Check if any descendant has errors (needed for showing parent hierarchy)
+            descendant_has_error = descendant_error[ws_id]
 
-def has_okr_descendants(node: Dict[str, Any], visited: Set[str] = None) -> bool:
-    """
-    Check if a node has any OKR workspace descendants.
-    Uses memoization and cycle detection to prevent recursion issues.
+            if has_red_flag:
+                # Show only lines with (Wrong) - already filtered by format_workspace_access when show_all=False
+                lines, _ = format_workspace_access(workspace, current_user_id, depth, show_all)
+                out.extend(lines)
+            elif parent_has_error or descendant_has_error:
+                # Parent or descendant has error, so show just workspace name (first line) to show hierarchy path
+                lines, _ = format_workspace_access(workspace, current_user_id, depth, show_all)
+                out.append(lines[0])
 
-    Args:
-        node: Node to check
-        visited: Set of already visited workspace IDs to detect cycles
-
-    Returns:
-        True if node or any descendant is OKR workspace
-    """
-    if visited is None:
-        visited = set()
+            # Pass down if current or parent has error
+            child_has_error = parent_has_error or has_red_flag or descendant_has_error
 
-    ws_id = node["workspace"]["id"]
-
-    # Detect cycles
-    if ws_id in visited:
-        return False
-
-    visited.add(ws_id)
+        # Add empty line after root-level workspaces (popped after all descendants)
+        if depth == 0:
+            stack.append(None)
 
-    if is_okr_workspace(node["workspace"]):
-        return True
+        # Queue children in reverse so they pop in order
+        stack.extend(
+            (child, depth + 1, child_has_error)
+            for child in reversed(node.get("children", []))
+        )
 
-    return any(
-        has_okr_descendants(child, visited) for child in node.get("children", [])
-    )
+    if write_output and out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -409,20 +464,34 @@ def main():
         action="store_true",
         help="Disable SSL certificate verification",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk API response cache (enabled by cache_ttl in config)",
+    )
 
     args = parser.parse_args()
 
     verify_ssl = not args.no_verify_ssl
+    use_cache = not args.no_cache
 
     try:
         print("Loading registries (users & user groups)...")
-        load_registries(verify_ssl=verify_ssl)
+        # The profile lookup is independent of the registries - fetch both concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            registries_future = executor.submit(
+                load_registries, verify_ssl=verify_ssl, use_cache=use_cache
+            )
+            current_user_future = executor.submit(
+                get_current_user_id, verify_ssl=verify_ssl
+            )
+            registries_future.result()
 
-        print("Fetching workspaces...")
-        workspaces = get_all_workspaces(verify_ssl=verify_ssl)
+            print("Fetching workspaces...")
+            workspaces = get_all_workspaces(verify_ssl=verify_ssl)
 
-        print("Identifying current user...")
-        current_user_id = get_current_user_id(verify_ssl=verify_ssl)
+            print("Identifying current user...")
+            current_user_id = current_user_future.result()
 
         print("Building hierarchy...")
         hierarchy = build_workspace_hierarchy(workspaces, verify_ssl=verify_ssl)
@@ -431,9 +500,15 @@ def main():
         print("OKR WORKSPACES ACCESS REPORT")
         print("=" * 60 + "\n")
 
-        # Process each root workspace
-        found_okr = False
+        # Compute OKR/error flags for every subtree in one pass (--all shows every
+        # OKR workspace, so only the OKR flags are needed then)
         roots = hierarchy["roots"]
+        flags = compute_subtree_flags(roots, current_user_id, check_errors=not args.all)
+
+        # Process each root workspace, collecting the whole report so it is
+        # written to stdout in a single call
+        found_okr = False
+        out = []
         for root in roots:
             # For --all flag, show everything
             if args.all:
@@ -444,12 +519,12 @@ def main():
                     depth=0,
                     show_all=True,
                     parent_has_error=False,
+                    flags=flags,
+                    out=out,
                 )
             else:
                 # Only show if workspace or descendants are OKR
-                if is_okr_workspace(root["workspace"]) or has_okr_descendants(
-                    root, set()
-                ):
+                if flags["has_okr"].get(root["workspace"]["id"], False):
                     found_okr = True
                     print_okr_hierarchy(
                         root,
@@ -457,7 +532,11 @@ def main():
                         depth=0,
                         show_all=False,
                         parent_has_error=False,
+                        flags=flags,
+                        out=out,
                     )
+        if out:
+            sys.stdout.write("\n".join(out) + "\n")
 
         if not found_okr:
             print("No OKR workspaces found.")
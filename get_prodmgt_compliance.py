@@ -7,30 +7,44 @@ This tool traverses the workspace hierarchy, identifies Product Management works
 """
 
 import argparse
+import functools
 import sys
-from typing import Any, Dict, List, Set
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
 
 from utils import (
     load_registries,
     make_api_request,
-    get_username_from_id,
+    get_usernames_bulk,
     get_usergroup_name,
+    get_usergroup_names_bulk,
     get_current_user_id,
     format_permission,
+    is_group_permission_wrong,
     build_folder_hierarchy,
     colorize,
+    get_indent,
     is_okr_workspace,
     get_all_workspaces,
+    ANSI_COLOR_CODES,
     WORKSPACE_COLOR_MAPPING,
+    WRONG_SUFFIX,
 )
 
+# Groups must start with this prefix (or be the admin group)
+VALID_GROUP_PREFIX = "SP_ProdMgt_"
+
+# Required permission per group name suffix (e.g. _F_U groups must have Full access)
+GROUP_SUFFIX_PERMISSIONS = {"_F_U": "full", "_W_U": "write", "_C_U": "comment"}
+
 
 def is_prodmgt_workspace(workspace: Dict[str, Any]) -> bool:
     """
     Determine if a workspace is Product Management related.
 
     Product Management workspaces are all workspaces that are NOT OKR workspaces.
-    This reuses the OKR detection logic and inverts it.
+    This reuses the OKR detection logic and inverts it, so the result is
+    memoized by workspace ID along with is_okr_workspace().
 
     Args:
         workspace: Workspace object from API
@@ -41,400 +55,381 @@ def is_prodmgt_workspace(workspace: Dict[str, Any]) -> bool:
     return not is_okr_workspace(workspace)
 
 
-def format_workspace_access(
-    workspace: Dict[str, Any],
-    current_user_id: str,
-    depth: int = 0,
-    show_all: bool = False,
-    verify_ssl: bool = True,
-) -> tuple[List[str], bool]:
+@functools.lru_cache(maxsize=None)
+def is_wrong_group(group_name: str, permission: str) -> bool:
     """
-    Format workspace access information as lines of text.
+    Check a group permission against the Product Management group rules:
+    groups must start with SP_ProdMgt_ OR be "Airfocus Admins", and groups
+    ending with _F_U / _W_U / _C_U must have Full / Write / Comment access.
+    Results are memoized, as the same (group, permission) pairs repeat across items.
 
     Args:
-        workspace: Workspace object
-        current_user_id: ID of the current authenticated user
-        depth: Depth level in hierarchy (used for '..' prefix)
-        show_all: If True, show all lines; if False, only show workspace name and RED lines
-        verify_ssl: Whether to verify SSL certificates
+        group_name: Name of the user group
+        permission: Permission the group has on the workspace or folder
 
     Returns:
-        Tuple of (list of formatted lines, has_red_flag boolean)
+        True if the group permission should be flagged as (Wrong)
     """
-    lines = []
-    has_red_flag = False
+    return is_group_permission_wrong(
+        group_name, permission, VALID_GROUP_PREFIX, GROUP_SUFFIX_PERMISSIONS
+    )
 
-    # Check if workspace has user permissions (excluding current user)
-    embedded = workspace.get("_embedded", {})
-    user_permissions = embedded.get("permissions", {})
-    has_user_access = any(uid != current_user_id for uid in user_permissions.keys())
 
-    # Build prefix using '..' for each depth level
-    prefix = ".." * depth
+def format_node_name_only(node: Dict[str, Any], depth: int = 0) -> str:
+    """
+    Format only the name line of a folder or workspace node without a (Wrong) flag,
+    as shown for error-free items on the hierarchy path to an error.
+    Same rendering as the first line of format_folder_access() / format_workspace_access(),
+    without iterating any permissions.
 
-    # Workspace name
-    ws_name = workspace.get("name", "Unnamed")
-    item_key = workspace.get("alias", "")
-    item_color = workspace.get("itemColor", "")
+    Args:
+        node: Node (can be folder or workspace)
+        depth: Depth level in hierarchy (used for '..' prefix)
 
-    # Determine workspace color for all its properties
-    workspace_color = None
-    if has_user_access:
-        has_red_flag = True
+    Returns:
+        Formatted name line
+    """
+    prefix = get_indent(depth)
+    if node.get("is_folder"):
+        folder_name = node.get("folder_data", {}).get("name", "Unnamed")
+        return colorize(f"{prefix}📁 {folder_name}", "yellow")
+
+    workspace = node["workspace"]
+    name_line = f"{prefix}{workspace.get('name', 'Unnamed')}"
+    workspace_color = WORKSPACE_COLOR_MAPPING.get(workspace.get("itemColor", ""))
+    if workspace_color:
+        return colorize(name_line, workspace_color)
+    return name_line
 
-    # Map item colors to terminal colors
-    if item_color and item_color in WORKSPACE_COLOR_MAPPING:
-        workspace_color = WORKSPACE_COLOR_MAPPING[item_color]
 
-    workspace_name_line = f"{prefix}{ws_name}"
+@functools.lru_cache(maxsize=None)
+def _section_layout(depth: int, color: Optional[str]) -> Tuple[str, str, str]:
+    """
+    Depth- and color-specific constants for _format_access(), computed once per pair.
 
-    # Get permissions from embedded data
-    group_permissions = embedded.get("userGroupPermissions", {})
-    default_permission = workspace.get("defaultPermission")
+    Args:
+        depth: Depth level of the item in the hierarchy
+        color: Terminal color for the item's lines (None for uncolored)
 
+    Returns:
+        Tuple of (sub-item indent, Users header, Groups header)
+    """
     # Detail indent: ALL lines have dots - add one more level of dots for details
-    detail_indent = ".." * (depth + 1)
+    detail_indent = get_indent(depth + 1)
+    users_header = f"{detail_indent}Users:"
+    groups_header = f"{detail_indent}Groups:"
+    if color:
+        users_header = colorize(users_header, color)
+        groups_header = colorize(groups_header, color)
+    # Sub-items get another level of dots
+    return get_indent(depth + 2), users_header, groups_header
+
+
+def _format_access(
+    name_line: str,
+    embedded: Dict[str, Any],
+    current_user_id: str,
+    depth: int,
+    show_all: bool,
+    color: Optional[str],
+    detail_lines: List[str] = (),
+) -> tuple[List[str], bool]:
+    """
+    Format the access lines shared by workspaces and folders: name line, details,
+    direct user permissions and group permissions.
 
-    # First: Color - Display only, no validation. Still used for coloring workspace details.
-    color_line = f"{detail_indent}Color: {item_color if item_color else '(empty)'}"
-    if workspace_color:
-        color_line = colorize(color_line, workspace_color)
+    Args:
+        name_line: Indented name line (without color or (Wrong) flag)
+        embedded: The item's _embedded data (permissions and userGroupPermissions)
+        current_user_id: ID of the current authenticated user
+        depth: Depth level in hierarchy (used for '..' prefix)
+        show_all: If True, show all lines; if False, only show the name and RED lines
+        color: Terminal color for the item's lines (None for uncolored)
+        detail_lines: Display-only lines shown after the name when show_all is set
 
-    if show_all:
-        lines.append(color_line)
+    Returns:
+        Tuple of (list of formatted lines, has_red_flag boolean)
+    """
+    # Slot 0 is reserved for the name line, which is only final once all flags are known
+    lines = [None]
+    # Bound once: lines are appended in the per-user/per-group loops below
+    add_line = lines.append
+    has_red_flag = False
 
-    # Second: Item Key - Display only, no validation
-    key_line = f"{detail_indent}Item Key: {item_key if item_key else '(empty)'}"
-    if workspace_color:
-        key_line = colorize(key_line, workspace_color)
+    # ANSI codes are looked up once per item; lines are then wrapped with plain
+    # f-strings instead of one colorize() call per line
+    reset_code = ANSI_COLOR_CODES["reset"]
+    red_code = ANSI_COLOR_CODES["red"]
+    color_code = ANSI_COLOR_CODES.get(color.lower(), "") if color else ""
 
-    if show_all:
-        lines.append(key_line)
+    def paint(line: str) -> str:
+        # Same result as colorize(line, color)
+        return f"{color_code}{line}{reset_code}" if color_code else line
 
-    # Third: Default Access - Display only, no validation
-    if default_permission:
-        perm_display = format_permission(default_permission)
-        default_line = f"{detail_indent}Default: {perm_display}"
-        if workspace_color:
-            default_line = colorize(default_line, workspace_color)
+    def flag_wrong(line: str) -> str:
+        # Show line in the item color, then append (Wrong) in RED
+        if color_code:
+            return f"{color_code}{line}{reset_code}{WRONG_SUFFIX}"
+        if color:
+            return f"{line}{WRONG_SUFFIX}"
+        return f"{red_code}{line} (Wrong){reset_code}"
 
-        if show_all:
-            lines.append(default_line)
+    if show_all:
+        lines.extend(detail_lines)
+
+    sub_indent, users_header, groups_header = _section_layout(depth, color)
 
-    # Add user permissions first (excluding current user)
-    user_perms_filtered = {
-        uid: perm for uid, perm in user_permissions.items() if uid != current_user_id
-    }
+    # Add user permissions first (excluding current user), filtered in one pass
+    # into a flat list of (user_id, permission) tuples; normalize_embedded()
+    # already sorted them by ID
+    user_entries = [
+        (uid, perm)
+        for uid, perm in embedded["permissions"].items()
+        if uid != current_user_id
+    ]
 
-    if user_perms_filtered:
+    if user_entries:
         # Always show users section when there are users (it's a RED flag issue)
-        users_header = f"{detail_indent}Users:"
-        if workspace_color:
-            users_header = colorize(users_header, workspace_color)
-        lines.append(users_header)
-        # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for user_id, permission in sorted(user_perms_filtered.items()):
-            user_name = get_username_from_id(user_id)
+        has_red_flag = True
+        add_line(users_header)
+        user_names = get_usernames_bulk(uid for uid, _ in user_entries)
+        for user_id, permission in user_entries:
             perm_str = format_permission(permission)
-            # Users in workspaces - show in workspace color, append (Wrong) in RED
-            user_line = f"{sub_indent}{user_name}: {perm_str}"
-            if workspace_color:
-                user_line = colorize(user_line, workspace_color) + colorize(
-                    " (Wrong)", "red"
-                )
-            else:
-                user_line = colorize(f"{user_line} (Wrong)", "red")
-            lines.append(user_line)
+            add_line(flag_wrong(f"{sub_indent}{user_names[user_id]}: {perm_str}"))
 
     # Add group permissions after users
+    group_permissions = embedded["userGroupPermissions"]
     if group_permissions:
+        # With show_all the header is always shown; otherwise only before the first RED group
+        groups_header_emitted = show_all
         if show_all:
-            groups_header = f"{detail_indent}Groups:"
-            if workspace_color:
-                groups_header = colorize(groups_header, workspace_color)
-            lines.append(groups_header)
-
-        # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for group_id, permission in sorted(group_permissions.items()):
-            group_name = get_usergroup_name(group_id)
-            perm_str = format_permission(permission)
-
-            # Check if group name/permission mismatch - show in workspace color + (Wrong) in RED
-            highlight = False
-
-            # Groups must start with SP_ProdMgt_ OR be "Airfocus Admins"
-            if (
-                not group_name.startswith("SP_ProdMgt_")
-                and group_name != "Airfocus Admins"
-            ):
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _F_U should have Full access
-            elif group_name.endswith("_F_U") and permission != "full":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _W_U should have Write access
-            elif group_name.endswith("_W_U") and permission != "write":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _C_U should have Comment access
-            elif group_name.endswith("_C_U") and permission != "comment":
-                highlight = True
-                has_red_flag = True
-
-            group_line = f"{sub_indent}{group_name}: {perm_str}"
-
+            add_line(groups_header)
+
+        group_names = get_usergroup_names_bulk(group_permissions)
+        group_entries = group_permissions.items()
+        if not show_all:
+            # Only RED groups are shown (already in ID order from normalize_embedded())
+            group_entries = [
+                (group_id, permission)
+                for group_id, permission in group_entries
+                if is_wrong_group(group_names[group_id], permission)
+            ]
+        for group_id, permission in group_entries:
+            group_name = group_names[group_id]
+
+            # Check if group name/permission mismatch - show in item color + (Wrong) in RED
+            highlight = is_wrong_group(group_name, permission)
             if highlight:
-                # Show line in workspace color, then append (Wrong) in RED
-                if workspace_color:
-                    group_line = colorize(group_line, workspace_color) + colorize(
-                        " (Wrong)", "red"
-                    )
-                else:
-                    group_line = colorize(f"{group_line} (Wrong)", "red")
-            elif workspace_color:
-                group_line = colorize(group_line, workspace_color)
+                has_red_flag = True
 
             if show_all or highlight:
-                if not show_all and highlight:
+                if not groups_header_emitted:
                     # Add Groups header only when showing RED group for first time
-                    if f"{detail_indent}Groups:" not in lines:
-                        groups_header = f"{detail_indent}Groups:"
-                        if workspace_color:
-                            groups_header = colorize(groups_header, workspace_color)
-                        lines.append(groups_header)
-                lines.append(group_line)
-
-    # Finalize workspace name line: show in workspace color, append (Wrong) in RED if has_red_flag
-    if workspace_color:
-        workspace_name_line = colorize(workspace_name_line, workspace_color)
-        if has_red_flag:
-            workspace_name_line = workspace_name_line + colorize(" (Wrong)", "red")
-    elif has_red_flag:
-        workspace_name_line = colorize(f"{workspace_name_line} (Wrong)", "red")
+                    add_line(groups_header)
+                    groups_header_emitted = True
+                group_line = f"{sub_indent}{group_name}: {format_permission(permission)}"
+                if highlight:
+                    group_line = flag_wrong(group_line)
+                elif color:
+                    group_line = paint(group_line)
+                add_line(group_line)
+
+    # Finalize name line: show in item color, append (Wrong) in RED if has_red_flag
+    if has_red_flag:
+        name_line = flag_wrong(name_line)
+    elif color:
+        name_line = paint(name_line)
 
-    # Prepend workspace name to the beginning of lines
-    lines.insert(0, workspace_name_line)
+    # Fill in the reserved first line (no list shift)
+    lines[0] = name_line
 
     return lines, has_red_flag
 
 
-def format_folder_access(
-    folder_data: Dict[str, Any],
+def format_workspace_access(
+    workspace: Dict[str, Any],
     current_user_id: str,
     depth: int = 0,
     show_all: bool = False,
     verify_ssl: bool = True,
 ) -> tuple[List[str], bool]:
     """
-    Format folder access information as lines of text.
+    Format workspace access information as lines of text.
 
     Args:
-        folder_data: Folder object with _embedded data (from build_folder_hierarchy)
+        workspace: Workspace object (from the registry, normalized by normalize_embedded())
         current_user_id: ID of the current authenticated user
         depth: Depth level in hierarchy (used for '..' prefix)
-        show_all: If True, show all lines; if False, only show folder name and RED lines
-        verify_ssl: Whether to verify SSL certificates (not used, kept for consistency)
+        show_all: If True, show all lines; if False, only show workspace name and RED lines
+        verify_ssl: Whether to verify SSL certificates
 
     Returns:
         Tuple of (list of formatted lines, has_red_flag boolean)
     """
-    lines = []
-    has_red_flag = False
+    item_key = workspace.get("alias", "")
+    item_color = workspace.get("itemColor", "")
 
-    # Build prefix using '..' for each depth level
-    prefix = ".." * depth
+    # Map item colors to terminal colors (used for all the workspace's lines)
+    workspace_color = WORKSPACE_COLOR_MAPPING.get(item_color) if item_color else None
 
-    # Folder name with icon - use yellow-orange color (we'll use 'yellow' as closest match)
-    folder_name = folder_data.get("name", "Unnamed")
-    folder_name_line = f"{prefix}📁 {folder_name}"
-    folder_name_line = colorize(folder_name_line, "yellow")
-
-    # Get permissions from embedded data (already fetched by build_folder_hierarchy)
-    embedded = folder_data.get("_embedded", {})
-    user_permissions = embedded.get("permissions", {})
-    group_permissions = embedded.get("userGroupPermissions", {})
-
-    # Check if folder has user permissions (excluding current user)
-    has_user_access = any(uid != current_user_id for uid in user_permissions.keys())
-    if has_user_access:
-        has_red_flag = True
-
-    # Detail indent: ALL lines have dots - add one more level of dots for details
-    detail_indent = ".." * (depth + 1)
+    # Color, Item Key and Default Access are display only (no validation)
+    detail_lines = []
+    if show_all:
+        detail_indent = get_indent(depth + 1)
+        detail_lines.append(
+            f"{detail_indent}Color: {item_color if item_color else '(empty)'}"
+        )
+        detail_lines.append(
+            f"{detail_indent}Item Key: {item_key if item_key else '(empty)'}"
+        )
+        default_permission = workspace.get("defaultPermission")
+        if default_permission:
+            detail_lines.append(
+                f"{detail_indent}Default: {format_permission(default_permission)}"
+            )
+        if workspace_color:
+            detail_lines = [colorize(line, workspace_color) for line in detail_lines]
+
+    return _format_access(
+        f"{get_indent(depth)}{workspace.get('name', 'Unnamed')}",
+        workspace["_embedded"],
+        current_user_id,
+        depth,
+        show_all,
+        workspace_color,
+        detail_lines,
+    )
 
-    # Add user permissions first (excluding current user)
-    user_perms_filtered = {
-        uid: perm for uid, perm in user_permissions.items() if uid != current_user_id
-    }
 
-    if user_perms_filtered:
-        # Always show users section when there are users (it's a RED flag issue)
-        users_header = f"{detail_indent}Users:"
-        users_header = colorize(users_header, "yellow")
-        lines.append(users_header)
-        # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for user_id, permission in sorted(user_perms_filtered.items()):
-            user_name = get_username_from_id(user_id)
-            perm_str = format_permission(permission)
-            # Users in folders - show in yellow, append (Wrong) in RED
-            user_line = f"{sub_indent}{user_name}: {perm_str}"
-            user_line = colorize(user_line, "yellow") + colorize(" (Wrong)", "red")
-            lines.append(user_line)
+def format_folder_access(
+    folder_data: Dict[str, Any],
+    current_user_id: str,
+    depth: int = 0,
+    show_all: bool = False,
+    verify_ssl: bool = True,
+) -> tuple[List[str], bool]:
+    """
+    Format folder access information as lines of text.
 
-    # Add group permissions after users
-    if group_permissions:
-        if show_all:
-            groups_header = f"{detail_indent}Groups:"
-            groups_header = colorize(groups_header, "yellow")
-            lines.append(groups_header)
-
-        # Sub-items get another level of dots
-        sub_indent = ".." * (depth + 2)
-        for group_id, permission in sorted(group_permissions.items()):
-            group_name = get_usergroup_name(group_id)
-            perm_str = format_permission(permission)
+    Args:
+        folder_data: Folder object with normalized _embedded data (from build_folder_hierarchy)
+        current_user_id: ID of the current authenticated user
+        depth: Depth level in hierarchy (used for '..' prefix)
+        show_all: If True, show all lines; if False, only show folder name and RED lines
+        verify_ssl: Whether to verify SSL certificates (not used, kept for consistency)
 
-            # Check if group name/permission mismatch - show in yellow + (Wrong) in RED
-            highlight = False
+    Returns:
+        Tuple of (list of formatted lines, has_red_flag boolean)
+    """
+    # Folder name with icon - use yellow-orange color (we'll use 'yellow' as closest match)
+    # Permissions come from embedded data (already fetched by build_folder_hierarchy)
+    return _format_access(
+        f"{get_indent(depth)}📁 {folder_data.get('name', 'Unnamed')}",
+        folder_data["_embedded"],
+        current_user_id,
+        depth,
+        show_all,
+        "yellow",
+    )
 
-            # Groups must start with SP_ProdMgt_ OR be "Airfocus Admins"
-            if (
-                not group_name.startswith("SP_ProdMgt_")
-                and group_name != "Airfocus Admins"
-            ):
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _F_U should have Full access
-            elif group_name.endswith("_F_U") and permission != "full":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _W_U should have Write access
-            elif group_name.endswith("_W_U") and permission != "write":
-                highlight = True
-                has_red_flag = True
-            # Groups ending with _C_U should have Comment access
-            elif group_name.endswith("_C_U") and permission != "comment":
-                highlight = True
-                has_red_flag = True
 
-            group_line = f"{sub_indent}{group_name}: {perm_str}"
+def access_has_red_flag(item: Dict[str, Any], current_user_id: str) -> bool:
+    """
+    Check whether a workspace or folder violates any Product Management access rule
+    without building output lines. Applies the same rules as format_workspace_access()
+    and format_folder_access() (color, item key and default access are display-only).
 
-            if highlight:
-                # Show line in yellow, then append (Wrong) in RED
-                group_line = colorize(group_line, "yellow") + colorize(
-                    " (Wrong)", "red"
-                )
-            else:
-                group_line = colorize(group_line, "yellow")
+    Args:
+        item: Workspace or folder object with normalized _embedded data
+        current_user_id: ID of the current authenticated user
 
-            if show_all or highlight:
-                if not show_all and highlight:
-                    # Add Groups header only when showing RED group for first time
-                    if f"{detail_indent}Groups:" not in lines:
-                        groups_header = f"{detail_indent}Groups:"
-                        groups_header = colorize(groups_header, "yellow")
-                        lines.append(groups_header)
-                lines.append(group_line)
+    Returns:
+        True if the item would be flagged as (Wrong)
+    """
+    embedded = item["_embedded"]
 
-    # Finalize folder name line: append (Wrong) in RED if has_red_flag
-    if has_red_flag:
-        folder_name_line = folder_name_line + colorize(" (Wrong)", "red")
+    # Direct user access (excluding current user)
+    user_permissions = embedded["permissions"]
+    if len(user_permissions) > (current_user_id in user_permissions):
+        return True
 
-    # Prepend folder name to the beginning of lines
-    lines.insert(0, folder_name_line)
+    # Resolve names lazily so the scan stops at the first wrong group
+    for group_id, permission in embedded["userGroupPermissions"].items():
+        if is_wrong_group(get_usergroup_name(group_id), permission):
+            return True
 
-    return lines, has_red_flag
+    return False
 
 
-def has_errors_in_node(
-    node: Dict[str, Any],
-    current_user_id: str,
-    verify_ssl: bool = True,
-    _cache: Dict[str, bool] = None,
-) -> bool:
+def compute_error_map(
+    roots: List[Dict[str, Any]], current_user_id: str
+) -> Dict[str, Dict[str, bool]]:
     """
-    Check if this node (folder or workspace) or any descendant has validation errors.
-    Uses a cache to avoid re-calling format_workspace_access() / format_folder_access()
-    for nodes that have already been checked.
+    Compute per-node error flags in a single iterative post-order pass.
 
     Args:
-        node: Node to check (can be folder or workspace node)
+        roots: Root nodes of the folder hierarchy (folders or orphaned workspaces)
         current_user_id: ID of current user
-        verify_ssl: Whether to verify SSL certificates
-        _cache: Optional cache of node_id -> has_red_flag results
 
     Returns:
-        True if node or any descendant has errors
+        Dictionary with:
+        - 'red_flag': folder/workspace ID -> True if the item itself has validation errors
+          (workspaces that are not Product Management are never flagged)
+        - 'has_error': folder/workspace ID -> True if the node or any descendant has errors
+        - 'is_prodmgt': workspace ID -> is_prodmgt_workspace() result, classified once
     """
-    if _cache is None:
-        _cache = {}
+    red_flag = {}
+    has_error = {}
+    is_prodmgt = {}
+    visited = set()
+
+    def workspace_flag(workspace: Dict[str, Any]) -> bool:
+        ws_id = workspace.get("id", "")
+        if ws_id not in red_flag:
+            is_prodmgt[ws_id] = is_prodmgt_workspace(workspace)
+            red_flag[ws_id] = is_prodmgt[ws_id] and access_has_red_flag(
+                workspace, current_user_id
+            )
+            has_error[ws_id] = red_flag[ws_id]
+        return red_flag[ws_id]
+
+    # Explicit stack of (node, children_done) avoids deep Python recursion
+    stack = [(root, False) for root in reversed(roots)]
+    while stack:
+        node, children_done = stack.pop()
+
+        if not node.get("is_folder"):
+            # Orphaned workspace at root level
+            workspace_flag(node["workspace"])
+            continue
 
-    # Check if current node is a folder
-    if node.get("is_folder"):
         folder_data = node.get("folder_data", {})
         folder_id = folder_data.get("id", "")
-
-        if folder_id in _cache:
-            has_red_flag = _cache[folder_id]
-        else:
-            _, has_red_flag = format_folder_access(
-                folder_data,
-                current_user_id,
-                depth=0,
-                show_all=False,
-                verify_ssl=verify_ssl,
+        children = node.get("children", [])
+
+        if not children_done:
+            # Detect cycles / shared subtrees
+            if folder_id in visited:
+                continue
+            visited.add(folder_id)
+            stack.append((node, True))
+            stack.extend((child, False) for child in reversed(children))
+            continue
+
+        red_flag[folder_id] = access_has_red_flag(folder_data, current_user_id)
+        workspace_errors = [
+            workspace_flag(ws_node["workspace"]) for ws_node in node.get("workspaces", [])
+        ]
+        has_error[folder_id] = (
+            red_flag[folder_id]
+            or any(workspace_errors)
+            or any(
+                has_error.get(child.get("folder_data", {}).get("id", ""), False)
+                for child in children
             )
-            _cache[folder_id] = has_red_flag
-        if has_red_flag:
-            return True
-
-        # Check workspaces in this folder
-        for ws_node in node.get("workspaces", []):
-            workspace = ws_node["workspace"]
-            ws_id = workspace.get("id", "")
-            if is_prodmgt_workspace(workspace):
-                if ws_id in _cache:
-                    has_red_flag = _cache[ws_id]
-                else:
-                    _, has_red_flag = format_workspace_access(
-                        workspace,
-                        current_user_id,
-                        depth=0,
-                        show_all=False,
-                        verify_ssl=verify_ssl,
-                    )
-                    _cache[ws_id] = has_red_flag
-                if has_red_flag:
-                    return True
-
-        # Check subfolders recursively
-        for child_folder in node.get("children", []):
-            if has_errors_in_node(child_folder, current_user_id, verify_ssl, _cache):
-                return True
-    else:
-        # It's a workspace node (orphaned workspace at root level)
-        workspace = node["workspace"]
-        ws_id = workspace.get("id", "")
-        if is_prodmgt_workspace(workspace):
-            if ws_id in _cache:
-                has_red_flag = _cache[ws_id]
-            else:
-                _, has_red_flag = format_workspace_access(
-                    workspace,
-                    current_user_id,
-                    depth=0,
-                    show_all=False,
-                    verify_ssl=verify_ssl,
-                )
-                _cache[ws_id] = has_red_flag
-            if has_red_flag:
-                return True
+        )
 
-    return False
+    return {"red_flag": red_flag, "has_error": has_error, "is_prodmgt": is_prodmgt}
 
 
 def print_folder_hierarchy(
@@ -444,118 +439,121 @@ def print_folder_hierarchy(
     show_all: bool = False,
     parent_has_error: bool = False,
     verify_ssl: bool = True,
-    _cache: Dict[str, bool] = None,
+    error_map: Dict[str, Dict[str, bool]] = None,
+    out: List[str] = None,
 ):
     """
-    Recursively print folder-based hierarchy using '..' for depth levels.
+    Print folder-based hierarchy using '..' for depth levels.
+    Traverses depth-first with an explicit stack (same order as a recursive walk), so
+    the shared arguments are bound once rather than on every recursive call.
+    Lines are collected and written to stdout in a single call. Items whose details
+    are not displayed are never formatted, and error-free subtrees are skipped.
 
     Args:
         node: Node (can be folder or workspace)
         current_user_id: ID of the current authenticated user
-        depth: Current depth level in hierarchy
+        depth: Depth level of node in hierarchy
         show_all: If True, show all items; if False, only show items with RED flags
         parent_has_error: If True, parent has errors so we should show this node's name
         verify_ssl: Whether to verify SSL certificates
-        _cache: Shared cache of node_id -> has_red_flag to avoid double formatting
+        error_map: Precomputed error flags from compute_error_map() (computed if omitted)
+        out: Optional list to append output lines to instead of writing them to stdout
     """
-    if _cache is None:
-        _cache = {}
+    if error_map is None:
+        error_map = compute_error_map([node], current_user_id)
+
+    red_flag = error_map["red_flag"]
+    has_error = error_map["has_error"]
+    is_prodmgt = error_map["is_prodmgt"]
+
+    write_output = out is None
+    if write_output:
+        out = []
+
+    # Stack of (node, depth, parent_has_error); None marks the empty line
+    # printed after a root-level folder once its subtree is done
+    stack = [(node, depth, parent_has_error)]
+    while stack:
+        entry = stack.pop()
+        if entry is None:
+            out.append("")
+            continue
+        node, depth, parent_has_error = entry
+
+        if not node.get("is_folder"):
+            # This is an orphaned workspace node at root level
+            workspace = node["workspace"]
+            ws_id = workspace.get("id", "")
+            if is_prodmgt[ws_id]:
+                if show_all or red_flag[ws_id]:
+                    lines, _ = format_workspace_access(
+                        workspace, current_user_id, depth, show_all, verify_ssl
+                    )
+                    out.extend(lines)
+                elif parent_has_error:
+                    # Show just workspace name
+                    out.append(format_node_name_only(node, depth))
+
+                # Add empty line after root-level workspaces
+                if depth == 0:
+                    out.append("")
+            continue
 
-    if node.get("is_folder"):
         # This is a folder node
         folder_data = node.get("folder_data", {})
         folder_id = folder_data.get("id", "")
 
-        # Format folder access
-        lines, has_red_flag = format_folder_access(
-            folder_data, current_user_id, depth, show_all, verify_ssl
-        )
-        # Cache the result so has_errors_in_node won't re-format this folder
-        _cache[folder_id] = has_red_flag
-
-        # Check if any descendant has errors
-        # Reuses the shared _cache to avoid double-calling format functions
-        descendant_has_error = (
-            has_errors_in_node(node, current_user_id, verify_ssl, _cache)
-            and not has_red_flag
-        )
+        # Add empty line after root-level folders (popped after all descendants)
+        if depth == 0:
+            stack.append(None)
+
+        # Nothing in an error-free subtree is displayed unless show_all or a parent has errors,
+        # so such subtrees are skipped entirely
+        if not (show_all or parent_has_error or has_error.get(folder_id, False)):
+            continue
+
+        # Flags from the precompute pass (no need to format just to learn them)
+        has_red_flag = red_flag.get(folder_id, False)
+
+        # Check if any descendant has errors (looked up from the precomputed map)
+        descendant_has_error = has_error.get(folder_id, False) and not has_red_flag
 
         # Display logic:
         # - If show_all: display everything
         # - If has_red_flag: display all lines with (Wrong) for this folder
         # - If parent_has_error or descendant_has_error: display only folder name
-        if show_all:
-            for line in lines:
-                print(line)
-        elif has_red_flag:
-            for line in lines:
-                print(line)
+        if show_all or has_red_flag:
+            lines, _ = format_folder_access(
+                folder_data, current_user_id, depth, show_all, verify_ssl
+            )
+            out.extend(lines)
         elif parent_has_error or descendant_has_error:
             # Show just folder name to display hierarchy path
-            print(lines[0])
+            out.append(format_node_name_only(node, depth))
 
         # Print workspaces in this folder
         for ws_node in node.get("workspaces", []):
             workspace = ws_node["workspace"]
             ws_id = workspace.get("id", "")
-            if is_prodmgt_workspace(workspace):
-                ws_lines, ws_has_red_flag = format_workspace_access(
-                    workspace, current_user_id, depth + 1, show_all, verify_ssl
-                )
-                # Cache this workspace's result
-                _cache[ws_id] = ws_has_red_flag
-
-                if show_all:
-                    for line in ws_lines:
-                        print(line)
-                elif ws_has_red_flag:
-                    for line in ws_lines:
-                        print(line)
+            if is_prodmgt[ws_id]:
+                if show_all or red_flag[ws_id]:
+                    ws_lines, _ = format_workspace_access(
+                        workspace, current_user_id, depth + 1, show_all, verify_ssl
+                    )
+                    out.extend(ws_lines)
                 elif parent_has_error or has_red_flag or descendant_has_error:
                     # Show just workspace name
-                    print(ws_lines[0])
+                    out.append(format_node_name_only(ws_node, depth + 1))
 
-        # Recursively print subfolders
-        for child_folder in node.get("children", []):
-            print_folder_hierarchy(
-                child_folder,
-                current_user_id,
-                depth + 1,
-                show_all,
-                parent_has_error=parent_has_error
-                or has_red_flag
-                or descendant_has_error,
-                verify_ssl=verify_ssl,
-                _cache=_cache,
-            )
-
-        # Add empty line after root-level folders
-        if depth == 0:
-            print()
-    else:
-        # This is an orphaned workspace node at root level
-        workspace = node["workspace"]
-        ws_id = workspace.get("id", "")
-        if is_prodmgt_workspace(workspace):
-            lines, has_red_flag = format_workspace_access(
-                workspace, current_user_id, depth, show_all, verify_ssl
-            )
-            # Cache this workspace's result
-            _cache[ws_id] = has_red_flag
-
-            if show_all:
-                for line in lines:
-                    print(line)
-            elif has_red_flag:
-                for line in lines:
-                    print(line)
-            elif parent_has_error:
-                # Show just workspace name
-                print(lines[0])
+        # Queue subfolders in reverse so they pop in order - pass down if current or parent has error
+        child_has_error = parent_has_error or has_red_flag or descendant_has_error
+        stack.extend(
+            (child_folder, depth + 1, child_has_error)
+            for child_folder in reversed(node.get("children", []))
+        )
 
-            # Add empty line after root-level workspaces
-            if depth == 0:
-                print()
+    if write_output and out:
+        sys.stdout.write("\n".join(out) + "\n")
 
 
 def main():
@@ -573,20 +571,34 @@ def main():
         action="store_true",
         help="Disable SSL certificate verification",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Bypass the on-disk API response cache (enabled by cache_ttl in config)",
+    )
 
     args = parser.parse_args()
 
     verify_ssl = not args.no_verify_ssl
+    use_cache = not args.no_cache
 
     try:
         print("Loading registries (users & user groups)...")
-        load_registries(verify_ssl=verify_ssl)
+        # The profile lookup is independent of the registries - fetch both concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            registries_future = executor.submit(
+                load_registries, verify_ssl=verify_ssl, use_cache=use_cache
+            )
+            current_user_future = executor.submit(
+                get_current_user_id, verify_ssl=verify_ssl
+            )
+            registries_future.result()
 
-        print("Fetching workspaces...")
-        workspaces = get_all_workspaces(verify_ssl=verify_ssl)
+            print("Fetching workspaces...")
+            workspaces = get_all_workspaces(verify_ssl=verify_ssl)
 
-        print("Identifying current user...")
-        current_user_id = get_current_user_id(verify_ssl=verify_ssl)
+            print("Identifying current user...")
+            current_user_id = current_user_future.result()
 
         print("Building folder hierarchy...")
         hierarchy = build_folder_hierarchy(workspaces, verify_ssl=verify_ssl)
@@ -598,6 +610,12 @@ def main():
         # Process each root node (can be folders or orphaned workspaces)
         found_items = False
         roots = hierarchy["roots"]
+
+        # Compute every node's error flags in one pass before printing
+        error_map = compute_error_map(roots, current_user_id)
+
+        # Collect the whole report and write it to stdout in a single call
+        out = []
         for root in roots:
             found_items = True
             print_folder_hierarchy(
@@ -607,7 +625,11 @@ def main():
                 show_all=args.all,
                 parent_has_error=False,
                 verify_ssl=verify_ssl,
+                error_map=error_map,
+                out=out,
             )
+        if out:
+            sys.stdout.write("\n".join(out) + "\n")
 
         if not found_items:
             print("No Product Management workspaces or folders found.")
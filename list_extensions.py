@@ -68,10 +68,11 @@ Examples:
         print(f"Available {args.extension_type.upper()} Extensions")
         print(f"{'='*60}\n")
         
-        for i, item in enumerate(items, 1):
-            print(f"Extension {i}:")
-            print(json.dumps(item, indent=2))
-            print()
+        # Serialize all extensions first and write them in a single call
+        sys.stdout.write(''.join(
+            f"Extension {i}:\n{json.dumps(item, indent=2)}\n\n"
+            for i, item in enumerate(items, 1)
+        ))
         
         print(f"{'='*60}")
         print(f"Total: {len(items)} extension(s) found")
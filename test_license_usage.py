@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Tests for the get_license_usage.py interactive shell.
+The Airfocus API is replaced by an in-memory fake; the on-disk cache uses a temp directory.
+"""
+
+import contextlib
+import io
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import utils
+from get_license_usage import LicenseShell
+
+
+def fake_api_request(
+    endpoint, method="GET", data=None, params=None, verify_ssl=True, read_only=False
+):
+    """Minimal API responses for the endpoints used by the license summary."""
+    if endpoint == "/api/team/users":
+        return [
+            {"userId": "u-1", "fullName": "Admin User", "role": "admin"},
+            {"userId": "u-2", "fullName": "Editor User", "role": "editor"},
+        ]
+    if endpoint == "/api/team/user-groups/search":
+        return {
+            "items": [
+                {"id": "g-1", "name": "SP_OKR_ERA_F", "_embedded": {"userIds": ["u-2"]}}
+            ],
+            "totalItems": 1,
+        }
+    if endpoint == "/api/workspaces/search":
+        return {"items": [{"id": "w-1", "name": "Workspace"}], "totalItems": 1}
+    if endpoint == "/api/team":
+        return {"state": {"seats": {"any": {"total": 5, "used": 2, "free": 3}}}}
+    raise AssertionError(f"Unexpected API call: {method} {endpoint}")
+
+
+class TestLicenseShellRefresh(unittest.TestCase):
+    """The 'refresh' command must reach the API even when the on-disk cache is enabled."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.config_patch = mock.patch.object(
+            utils,
+            "_config",
+            {
+                "apikey": "test",
+                "baseurl": "https://example.invalid",
+                "cache_ttl": "300",
+                "cache_dir": self.cache_dir,
+            },
+        )
+        self.config_patch.start()
+        self.api = mock.Mock(side_effect=fake_api_request)
+        self.api_patch = mock.patch.object(utils, "make_api_request", self.api)
+        self.api_patch.start()
+        utils.reset_registries()
+
+    def tearDown(self):
+        utils.reset_registries()
+        self.api_patch.stop()
+        self.config_patch.stop()
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def run_commands(self, shell, *commands):
+        with contextlib.redirect_stdout(io.StringIO()):
+            for command in commands:
+                shell.onecmd(command)
+
+    def test_second_session_reads_from_cache(self):
+        self.run_commands(LicenseShell(use_cache=True), "summary")
+        self.assertGreater(self.api.call_count, 0)
+
+        utils.reset_registries()
+        self.api.reset_mock()
+        self.run_commands(LicenseShell(use_cache=True), "summary")
+        self.assertEqual(self.api.call_count, 0)
+
+    def test_refresh_reaches_api(self):
+        shell = LicenseShell(use_cache=True)
+        self.run_commands(shell, "summary", "refresh")
+        self.api.reset_mock()
+
+        self.run_commands(shell, "summary")
+        called = {call.args[0] for call in self.api.call_args_list}
+        self.assertEqual(
+            called,
+            {
+                "/api/team/users",
+                "/api/team/user-groups/search",
+                "/api/workspaces/search",
+                "/api/team",
+            },
+        )
+
+    def test_refresh_updates_cache(self):
+        shell = LicenseShell(use_cache=True)
+        self.run_commands(shell, "summary", "refresh", "summary")
+
+        # A new session afterwards is served from the refreshed cache entries
+        utils.reset_registries()
+        self.api.reset_mock()
+        self.run_commands(LicenseShell(use_cache=True), "summary")
+        self.assertEqual(self.api.call_count, 0)
+
+    def test_refresh_only_bypasses_cache_once(self):
+        shell = LicenseShell(use_cache=True)
+        self.run_commands(shell, "summary", "refresh", "summary")
+
+        utils.reset_registries()
+        self.api.reset_mock()
+        self.run_commands(shell, "summary")
+        self.assertEqual(self.api.call_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,24 +3,50 @@ Shared utility functions for Airfocus API tools.
 Provides configuration loading, API requests, and helper functions.
 """
 
+import functools
+import hashlib
 import json
+import os
 import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from configparser import ConfigParser
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    import orjson  # Optional: faster parsing of large workspace payloads
+except ImportError:
+    orjson = None
 
 # Increase recursion limit for deep workspace hierarchies and large datasets
 # Set high enough to handle enterprise-scale deployments (16k+ users)
 sys.setrecursionlimit(50000)
 
 
+_config: Optional[Dict[str, str]] = None  # Parsed config, loaded once per process
+# Shared HTTP sessions (connection pooling): one for all calls, and one whose
+# retry also covers POST, used only for read-only search/list POSTs
+_sessions: Dict[bool, requests.Session] = {}
+_session_lock = threading.Lock()
+
+
 def load_config() -> Dict[str, str]:
     """
     Load configuration from the 'config' file in the project root.
-    Returns a dictionary with configuration values.
+    Returns a dictionary with configuration values (parsed once per process).
     """
+    global _config
+
+    if _config is not None:
+        return _config
+
     config_path = Path(__file__).parent / "config"
 
     if not config_path.exists():
@@ -45,15 +71,104 @@ def load_config() -> Dict[str, str]:
         print(f"Error: Missing required configuration keys: {', '.join(missing_keys)}")
         sys.exit(1)
 
+    _config = config
     return config
 
 
+# Retry defaults, overridable with 'retry_total', 'retry_backoff_factor' and
+# 'retry_status_codes' in config (see config.example)
+DEFAULT_RETRY_TOTAL = 3
+DEFAULT_RETRY_BACKOFF_FACTOR = 0.3
+DEFAULT_RETRY_STATUS_CODES = "429, 502, 503, 504"
+
+
+def get_retry_settings() -> Tuple[int, float, list]:
+    """
+    Get the retry settings for transient API failures from config.
+
+    Returns:
+        Tuple of (total retries, backoff factor in seconds, list of HTTP status codes to retry)
+    """
+    config = load_config()
+
+    try:
+        total = int(config.get("retry_total", DEFAULT_RETRY_TOTAL) or 0)
+        backoff_factor = float(
+            config.get("retry_backoff_factor", DEFAULT_RETRY_BACKOFF_FACTOR) or 0
+        )
+        status_codes = [
+            int(code)
+            for code in config.get("retry_status_codes", DEFAULT_RETRY_STATUS_CODES).split(",")
+            if code.strip()
+        ]
+    except ValueError:
+        print("Error: Invalid retry_total, retry_backoff_factor or retry_status_codes value in config")
+        sys.exit(1)
+
+    return max(0, total), max(0.0, backoff_factor), status_codes
+
+
+def get_session(read_only: bool = False) -> requests.Session:
+    """
+    Get the shared HTTP session used for API calls.
+
+    Reusing a session keeps TCP/TLS connections alive between requests and
+    retries transient failures (by default 429 and 502-504, see get_retry_settings())
+    with exponential backoff, honoring Retry-After. The default session only retries idempotent methods
+    (GET, PUT, DELETE, ...), so write POSTs are never replayed; the read_only
+    session also retries POST and must only be used for search/list POSTs.
+    The authentication headers are set once on each session.
+
+    Args:
+        read_only: If True, return the session that also retries POST requests
+    """
+    session = _sessions.get(read_only)
+
+    if session is None:
+        with _session_lock:  # Tools may issue the first requests from worker threads
+            session = _sessions.get(read_only)
+            if session is None:
+                allowed_methods = Retry.DEFAULT_ALLOWED_METHODS
+                if read_only:
+                    allowed_methods = allowed_methods | {"POST"}
+                total, backoff_factor, status_codes = get_retry_settings()
+                max_requests = get_max_concurrent_requests()
+                retry = Retry(
+                    total=total,
+                    backoff_factor=backoff_factor,
+                    status_forcelist=status_codes,
+                    allowed_methods=allowed_methods,
+                    # Return the last response once retries run out, so
+                    # raise_for_status() reports it with its body
+                    raise_on_status=False,
+                )
+                # Pool headroom for callers that overlap a paginated fetch with other requests
+                adapter = HTTPAdapter(
+                    pool_connections=max_requests,
+                    pool_maxsize=max_requests * 2,
+                    max_retries=retry,
+                )
+                config = load_config()
+                session = requests.Session()
+                session.headers.update(
+                    {
+                        "Authorization": f"Bearer {config['apikey']}",
+                        "Content-Type": "application/json",
+                    }
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _sessions[read_only] = session
+    return session
+
+
 def make_api_request(
     endpoint: str,
     method: str = "GET",
     data: Optional[Dict[str, Any]] = None,
     params: Optional[Dict[str, Any]] = None,
     verify_ssl: bool = True,
+    read_only: bool = False,
 ) -> Dict[str, Any]:
     """
     Make an authenticated API request to Airfocus.
@@ -64,6 +179,8 @@ def make_api_request(
         data: Request body data for POST requests
         params: Query parameters
         verify_ssl: Whether to verify SSL certificates (default: True)
+        read_only: Set for POSTs that only search/list data, so transient failures
+                   (e.g. 429) are retried like GETs (default: False)
 
     Returns:
         Parsed JSON response
@@ -72,11 +189,6 @@ def make_api_request(
     baseurl = config["baseurl"].rstrip("/")
     url = f"{baseurl}{endpoint}"
 
-    headers = {
-        "Authorization": f"Bearer {config['apikey']}",
-        "Content-Type": "application/json",
-    }
-
     # Suppress SSL warnings if verify_ssl is False
     if not verify_ssl:
         import urllib3
@@ -84,16 +196,19 @@ def make_api_request(
         urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
     try:
-        response = requests.request(
+        response = get_session(read_only).request(
             method=method,
             url=url,
-            headers=headers,
             json=data,
             params=params,
             verify=verify_ssl,
         )
         response.raise_for_status()
-        return response.json() if response.content else {}
+        if not response.content:
+            return {}
+        if orjson is not None:
+            return orjson.loads(response.content)
+        return response.json()
     except requests.exceptions.RequestException as e:
         error_msg = f"API request failed: {e}"
         if (
@@ -109,6 +224,282 @@ def make_api_request(
 api_get = make_api_request
 
 
+def _cached_call(key_parts: list, fetch, refresh: bool = False) -> Any:
+    """
+    Return fetch() through the on-disk response cache.
+
+    Caching is enabled by setting 'cache_ttl' (seconds) in the config file;
+    entries are stored under 'cache_dir' (default: ~/.cache/pyAirfocusTools).
+    Without 'cache_ttl' this just calls fetch().
+    Failed fetches raise before anything is written, so errors are never cached.
+
+    Args:
+        key_parts: JSON-serializable values identifying the entry
+        fetch: Callable returning the JSON-serializable value to cache
+        refresh: If True, ignore any cached entry and store the fresh value
+
+    Returns:
+        Cached or freshly fetched value
+    """
+    config = load_config()
+
+    try:
+        cache_ttl = int(config.get("cache_ttl", "0") or 0)
+    except ValueError:
+        print(f"Error: Invalid cache_ttl value in config: {config['cache_ttl']}")
+        sys.exit(1)
+
+    if cache_ttl <= 0:
+        return fetch()
+
+    cache_dir = Path(
+        config.get("cache_dir", "~/.cache/pyAirfocusTools")
+    ).expanduser()
+
+    # Key on the tenant and credentials too, so different configs never share entries
+    key_source = json.dumps(
+        [config["baseurl"], config["apikey"], *key_parts],
+        sort_keys=True,
+    )
+    cache_file = cache_dir / f"{hashlib.sha256(key_source.encode()).hexdigest()}.json"
+
+    if not refresh:
+        try:
+            if time.time() - cache_file.stat().st_mtime < cache_ttl:
+                with open(cache_file, "r") as f:
+                    return json.load(f)
+        except (OSError, ValueError):
+            pass  # Missing, unreadable or corrupt entry - fall through to the API
+
+    value = fetch()
+
+    # Write atomically; mkstemp creates the file readable by the owner only
+    tmp_path = None
+    try:
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(value, f)
+        os.replace(tmp_path, cache_file)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: Could not write API cache: {e}")
+        # Do not leave a partial temp file behind in the cache directory
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    return value
+
+
+def cached_api_request(
+    endpoint: str,
+    method: str = "GET",
+    data: Optional[Dict[str, Any]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    verify_ssl: bool = True,
+    refresh: bool = False,
+    read_only: bool = False,
+) -> Dict[str, Any]:
+    """
+    Make an API request through the on-disk response cache.
+
+    Caching is enabled by setting 'cache_ttl' (seconds) in the config file;
+    responses are stored under 'cache_dir' (default: ~/.cache/pyAirfocusTools).
+    Without 'cache_ttl' this behaves exactly like make_api_request().
+    Failed requests raise before anything is written, so errors are never cached.
+
+    Args:
+        endpoint: API endpoint path (e.g., '/api/team/users')
+        method: HTTP method (GET, POST, etc.)
+        data: Request body data for POST requests
+        params: Query parameters
+        verify_ssl: Whether to verify SSL certificates (default: True)
+        refresh: If True, ignore any cached entry and store the fresh response
+        read_only: Set for search/list POSTs so they are retried (see make_api_request)
+
+    Returns:
+        Parsed JSON response
+    """
+    return _cached_call(
+        [method, endpoint, data, params],
+        lambda: make_api_request(
+            endpoint,
+            method=method,
+            data=data,
+            params=params,
+            verify_ssl=verify_ssl,
+            read_only=read_only,
+        ),
+        refresh=refresh,
+    )
+
+
+# Concurrent page requests issued by fetch_all_pages(): default, and cap for
+# 'max_concurrent_requests' in config
+DEFAULT_CONCURRENT_REQUESTS = 8
+MAX_CONCURRENT_REQUESTS = 32
+
+# Largest 'limit' accepted by the Airfocus search endpoints (see openapi.json)
+MAX_PAGE_SIZE = 1000
+
+
+def get_page_size() -> int:
+    """
+    Get the page size for paginated search requests.
+    Reads 'page_size' from config (default and maximum: MAX_PAGE_SIZE).
+    """
+    config = load_config()
+
+    try:
+        page_size = int(config.get("page_size", MAX_PAGE_SIZE) or MAX_PAGE_SIZE)
+    except ValueError:
+        print(f"Error: Invalid page_size value in config: {config['page_size']}")
+        sys.exit(1)
+
+    return max(1, min(page_size, MAX_PAGE_SIZE))
+
+
+def get_max_concurrent_requests() -> int:
+    """
+    Get the number of page requests fetch_all_pages() may issue concurrently.
+    Reads 'max_concurrent_requests' from config (default: DEFAULT_CONCURRENT_REQUESTS,
+    clamped to 1..MAX_CONCURRENT_REQUESTS).
+    """
+    config = load_config()
+
+    try:
+        max_requests = int(
+            config.get("max_concurrent_requests", DEFAULT_CONCURRENT_REQUESTS)
+            or DEFAULT_CONCURRENT_REQUESTS
+        )
+    except ValueError:
+        print(
+            "Error: Invalid max_concurrent_requests value in config: "
+            f"{config['max_concurrent_requests']}"
+        )
+        sys.exit(1)
+
+    return max(1, min(max_requests, MAX_CONCURRENT_REQUESTS))
+
+
+def fetch_all_pages(
+    endpoint: str,
+    data: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = None,
+    verify_ssl: bool = True,
+    use_cache: bool = False,
+    refresh: bool = False,
+) -> list:
+    """
+    Fetch every page of a paginated POST search endpoint.
+
+    The first page reveals 'totalItems'; all remaining pages are then
+    requested concurrently and merged back in offset order.
+
+    Args:
+        endpoint: API endpoint path (e.g., '/api/workspaces/search')
+        data: Request body data sent with every page request
+        limit: Page size (default: get_page_size())
+        verify_ssl: Whether to verify SSL certificates (default: True)
+        use_cache: Whether to go through the on-disk response cache (default: False).
+                   The merged item list is cached as one entry (keyed on endpoint and
+                   body), so pages fetched at different times are never combined
+        refresh: If True, ignore any cached entry and store the fresh items (default: False)
+
+    Returns:
+        List of items from all pages
+    """
+    if data is None:
+        data = {}
+    if limit is None:
+        limit = get_page_size()
+
+    def fetch_page(offset: int) -> Dict[str, Any]:
+        return make_api_request(
+            endpoint,
+            method="POST",
+            data=data,
+            params={"offset": offset, "limit": limit},
+            verify_ssl=verify_ssl,
+            read_only=True,
+        )
+
+    def fetch_items() -> list:
+        first_page = fetch_page(0)
+        items = list(first_page.get("items", []))
+        remaining_offsets = range(limit, first_page.get("totalItems", 0), limit)
+
+        if remaining_offsets:
+            max_workers = min(get_max_concurrent_requests(), len(remaining_offsets))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # executor.map preserves offset order
+                for page in executor.map(fetch_page, remaining_offsets):
+                    items.extend(page.get("items", []))
+
+        return items
+
+    if use_cache:
+        return _cached_call(
+            ["POST", endpoint, data, "all_pages"], fetch_items, refresh=refresh
+        )
+    return fetch_items()
+
+
+def normalize_embedded(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Ensure a workspace or folder object has an '_embedded' dict with 'permissions'
+    and 'userGroupPermissions' dicts, so hot loops can index them directly instead
+    of chaining .get(..., {}) lookups. Both dicts are sorted by ID once here, so
+    report output can iterate them in a stable order without re-sorting.
+
+    Args:
+        item: Workspace or folder object from the API (modified in place)
+
+    Returns:
+        The same object
+    """
+    embedded = item.get("_embedded")
+    if embedded is None:
+        embedded = item["_embedded"] = {}
+    for key in ("permissions", "userGroupPermissions"):
+        permissions = embedded.get(key)
+        if permissions is None:
+            embedded[key] = {}
+        elif len(permissions) > 1:
+            embedded[key] = dict(sorted(permissions.items()))
+    return item
+
+
+def fetch_folders_by_ids(folder_ids: list, verify_ssl: bool = True) -> list:
+    """
+    Fetch folders (workspace groups) with their embedded data (permissions and workspaces)
+    in a single POST /api/workspaces/groups/list request.
+
+    Args:
+        folder_ids: List of folder IDs
+        verify_ssl: Whether to verify SSL certificates (default: True)
+
+    Returns:
+        List of folder objects (inaccessible folders, returned as null, are skipped),
+        normalized with normalize_embedded()
+    """
+    if not folder_ids:
+        return []
+
+    # Use list endpoint to get all folders with embedded data in one call
+    list_response = make_api_request(
+        "/api/workspaces/groups/list",
+        method="POST",
+        data=folder_ids,
+        verify_ssl=verify_ssl,
+        read_only=True,
+    )
+    # Response is an array of folders with embedded data (null for inaccessible folders)
+    return [normalize_embedded(folder) for folder in list_response if folder]
+
+
 # Map Airfocus item colors to terminal ANSI color names
 WORKSPACE_COLOR_MAPPING = {
     "yellow": "yellow",
@@ -119,6 +510,9 @@ WORKSPACE_COLOR_MAPPING = {
 }
 
 
+_okr_workspace_cache: Dict[str, bool] = {}  # workspace_id -> is_okr_workspace() result
+
+
 def is_okr_workspace(workspace: Dict[str, Any]) -> bool:
     """
     Determine if a workspace is OKR-related.
@@ -127,30 +521,67 @@ def is_okr_workspace(workspace: Dict[str, Any]) -> bool:
     The Item Key validation (should start with 'OKR') is a separate
     validation rule applied to OKR workspaces.
 
+    Results are memoized by workspace ID, as hierarchy traversals classify
+    the same workspace many times.
+
     Args:
         workspace: Workspace object from API
 
     Returns:
         True if workspace is OKR-related
     """
-    # Check namespace field for OKR indicator
-    namespace = workspace.get("namespace", "")
+    ws_id = workspace.get("id")
+    cached = _okr_workspace_cache.get(ws_id)
+    if cached is not None:
+        return cached
 
-    # namespace can be a string like "app:okr"
-    if isinstance(namespace, str) and "okr" in namespace.lower():
-        return True
-
-    # Or it might be a dict with typeId
+    # namespace can be a string like "app:okr" or a dict with typeId
+    namespace = workspace.get("namespace") or ""
     if isinstance(namespace, dict):
-        type_id = namespace.get("typeId", "")
-        if "okr" in type_id.lower():
-            return True
+        namespace = namespace.get("typeId") or ""
 
-    # Also check item type for OKR keywords
-    item_type = workspace.get("itemType", "")
-    if "okr" in item_type.lower():
-        return True
+    # Single lowercase test over namespace and item type ('|' keeps the
+    # two values from forming a match across their boundary)
+    item_type = workspace.get("itemType") or ""
+    is_okr = "okr" in f"{namespace}|{item_type}".lower()
+
+    if ws_id is not None:
+        _okr_workspace_cache[ws_id] = is_okr
+    return is_okr
+
+
+# Group that is always allowed on OKR and Product Management items
+ADMIN_GROUP_NAME = "Airfocus Admins"
 
+
+def is_group_permission_wrong(
+    group_name: str,
+    permission: str,
+    valid_prefix: str,
+    suffix_permissions: Dict[str, str],
+) -> bool:
+    """
+    Check a group permission against a compliance tool's group naming rules
+    (shared by the OKR and Product Management tools): groups must start with
+    valid_prefix OR be "Airfocus Admins", and groups ending with one of the
+    suffixes must have the matching permission.
+
+    Args:
+        group_name: Name of the user group
+        permission: Permission the group has on the workspace or folder
+        valid_prefix: Required group name prefix (e.g., 'SP_OKR_')
+        suffix_permissions: Required permission per group name suffix (e.g., {'_F': 'full'})
+
+    Returns:
+        True if the group permission should be flagged as (Wrong)
+    """
+    if group_name == ADMIN_GROUP_NAME:
+        return False
+    if not group_name.startswith(valid_prefix):
+        return True
+    for suffix, expected_permission in suffix_permissions.items():
+        if group_name.endswith(suffix):
+            return permission != expected_permission
     return False
 
 
@@ -160,10 +591,17 @@ _group_registry: Dict[
     str, Dict[str, Any]
 ] = {}  # User Groups (Global Teams) from config
 _workspace_registry: Dict[str, Dict[str, Any]] = {}  # Workspaces
+_user_index: Dict[str, int] = {}  # user_id -> bit position for user masks
+_users_by_role: Dict[str, set] = {}  # role -> set of user_ids
+_user_names: Dict[str, str] = {}  # user_id -> display name (precomputed)
+_group_names: Dict[str, str] = {}  # group_id -> group name (precomputed)
 _registries_loaded: bool = False
+_team_info: Optional[Dict[str, Any]] = None  # Cached GET /api/team response
 
 
-def load_registries(verify_ssl: bool = True):
+def load_registries(
+    verify_ssl: bool = True, use_cache: bool = False, refresh: bool = False
+):
     """
     Pre-fetch all users, user groups, and workspaces from the API once and cache them.
     This implements the Registry Pattern to avoid multiple API calls.
@@ -174,23 +612,61 @@ def load_registries(verify_ssl: bool = True):
 
     Args:
         verify_ssl: Whether to verify SSL certificates (default: True)
+        use_cache: Whether to read the API responses through the on-disk cache.
+                   Only read-only reporting tools should enable this (default: False)
+        refresh: If True, reload even if already loaded and bypass on-disk cached
+                 entries, storing the fresh responses (default: False)
     """
-    global _user_registry, _group_registry, _workspace_registry, _registries_loaded
+    global _user_registry, _group_registry, _workspace_registry, _user_index
+    global _users_by_role, _user_names, _group_names, _registries_loaded
 
-    if _registries_loaded:
+    if _registries_loaded and not refresh:
         return
 
-    # Fetch all users
-    users = make_api_request("/api/team/users", verify_ssl=verify_ssl)
-    _user_registry = {user["userId"]: user for user in users}
+    if use_cache:
+        request = functools.partial(cached_api_request, refresh=refresh)
+    else:
+        request = make_api_request
+
+    # The three registries are independent: fetch them concurrently
+    # (remaining workspace pages are fanned out again inside fetch_all_pages)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        users_future = executor.submit(request, "/api/team/users", verify_ssl=verify_ssl)
+        # POST /api/team/user-groups/search (not in OpenAPI spec but exists)
+        groups_future = executor.submit(
+            request,
+            "/api/team/user-groups/search",
+            method="POST",
+            data={},
+            verify_ssl=verify_ssl,
+            read_only=True,
+        )
+        workspaces_future = executor.submit(
+            fetch_all_pages,
+            "/api/workspaces/search",
+            data={},
+            verify_ssl=verify_ssl,
+            use_cache=use_cache,
+            refresh=refresh,
+        )
+        users = users_future.result()
+        user_groups_response = groups_future.result()
+        all_workspaces = workspaces_future.result()
 
-    # Fetch all user groups using the undocumented endpoint
-    # POST /api/team/user-groups/search (not in OpenAPI spec but exists)
-    user_groups_response = make_api_request(
-        "/api/team/user-groups/search", method="POST", data={}, verify_ssl=verify_ssl
-    )
+    # Build the users registry
+    _user_registry = {user["userId"]: user for user in users}
+    _user_index = {user_id: i for i, user_id in enumerate(_user_registry)}
+    _users_by_role = {}
+    for user_id, user in _user_registry.items():
+        _users_by_role.setdefault(user.get("role"), set()).add(user_id)
+    # Display names are resolved once here, so name lookups are a single dict get
+    _user_names = {
+        user_id: user.get("fullName") or user.get("email") or user_id
+        for user_id, user in _user_registry.items()
+    }
 
     # Build the user groups registry with actual names from the API
+    # (fetched with the undocumented user-groups search endpoint)
     user_groups = user_groups_response.get("items", [])
     _group_registry = {
         group["id"]: {
@@ -202,31 +678,35 @@ def load_registries(verify_ssl: bool = True):
         }
         for group in user_groups
     }
+    _group_names = {
+        group_id: group["name"] for group_id, group in _group_registry.items()
+    }
 
-    # Fetch all workspaces
-    all_workspaces = []
-    offset = 0
-    limit = 100
+    # Build the workspace registry (embedded permissions normalized once here)
+    _workspace_registry = {ws["id"]: normalize_embedded(ws) for ws in all_workspaces}
 
-    while True:
-        response = make_api_request(
-            "/api/workspaces/search",
-            method="POST",
-            data={},
-            params={"offset": offset, "limit": limit},
-            verify_ssl=verify_ssl,
-        )
-        items = response.get("items", [])
-        all_workspaces.extend(items)
-        total_items = response.get("totalItems", 0)
-        if offset + limit >= total_items:
-            break
-        offset += limit
+    _registries_loaded = True
 
-    # Build the workspace registry
-    _workspace_registry = {ws["id"]: ws for ws in all_workspaces}
 
-    _registries_loaded = True
+def reset_registries():
+    """
+    Discard the in-memory registries and cached team info so the next
+    load_registries() / get_team_info() call fetches fresh data.
+    Used by long-running sessions (e.g. get_license_usage.py --interactive).
+    """
+    global _user_registry, _group_registry, _workspace_registry, _user_index
+    global _users_by_role, _user_names, _group_names, _registries_loaded, _team_info
+
+    _user_registry = {}
+    _group_registry = {}
+    _workspace_registry = {}
+    _user_index = {}
+    _users_by_role = {}
+    _user_names = {}
+    _group_names = {}
+    _team_info = None
+    _registries_loaded = False
+    _okr_workspace_cache.clear()
 
 
 def get_all_workspaces(verify_ssl: bool = True) -> list:
@@ -258,10 +738,24 @@ def get_username_from_id(user_id: str) -> str:
     if not _registries_loaded:
         load_registries()
 
-    user = _user_registry.get(user_id)
-    if user:
-        return user.get("fullName") or user.get("email") or user_id
-    return user_id
+    return _user_names.get(user_id, user_id)
+
+
+def get_usernames_bulk(user_ids) -> Dict[str, str]:
+    """
+    Resolve many user IDs to human-readable names in one pass over the registry.
+
+    Args:
+        user_ids: Iterable of user UUIDs
+
+    Returns:
+        Dictionary mapping user ID to name (same fallbacks as get_username_from_id)
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    user_names = _user_names
+    return {user_id: user_names.get(user_id, user_id) for user_id in user_ids}
 
 
 def get_usergroup_name(group_id: str) -> str:
@@ -280,13 +774,25 @@ def get_usergroup_name(group_id: str) -> str:
     if not _registries_loaded:
         load_registries()
 
-    # Check user groups from the API
-    group = _group_registry.get(group_id)
-    if group:
-        return group.get("name", "Unknown Group")
+    # Falls back to the ID for groups not in the registry (shouldn't happen)
+    return _group_names.get(group_id, group_id)
+
+
+def get_usergroup_names_bulk(group_ids) -> Dict[str, str]:
+    """
+    Resolve many user group IDs to names in one pass over the registry.
 
-    # Group not in registry - return ID (shouldn't happen)
-    return group_id
+    Args:
+        group_ids: Iterable of user group UUIDs
+
+    Returns:
+        Dictionary mapping group ID to name (same fallbacks as get_usergroup_name)
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    group_names = _group_names
+    return {group_id: group_names.get(group_id, group_id) for group_id in group_ids}
 
 
 # Alias for backward compatibility
@@ -374,6 +880,22 @@ def get_user_role(user_id: str) -> str:
     return ""
 
 
+def get_users_by_role(role: str) -> set:
+    """
+    Get all user IDs with a given role from the registry.
+
+    Args:
+        role: Role to look up (admin, contributor, or editor)
+
+    Returns:
+        Set of user IDs with that role (do not mutate)
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    return _users_by_role.get(role, set())
+
+
 def get_groups_by_prefix(prefix: str) -> list:
     """
     Get all user groups whose name starts with the given prefix.
@@ -459,6 +981,9 @@ def set_user_role(user_id: str, role: str, verify_ssl: bool = True) -> bool:
 
         # Update the registry cache
         if user_id in _user_registry:
+            previous_role = _user_registry[user_id].get("role")
+            _users_by_role.get(previous_role, set()).discard(user_id)
+            _users_by_role.setdefault(role, set()).add(user_id)
             _user_registry[user_id]["role"] = role
 
         return True
@@ -499,16 +1024,13 @@ def build_workspace_hierarchy(
     # Create a mapping of workspace ID to workspace data
     workspace_map = {ws["id"]: ws for ws in workspaces}
 
-    # Fetch workspace relations from the API
-    response = make_api_request(
+    # Fetch workspace relations from the API (paginated, remaining pages fetched concurrently)
+    relations = fetch_all_pages(
         "/api/workspaces/workspace-relations/search",
-        method="POST",
         data={},
         verify_ssl=verify_ssl,
     )
 
-    relations = response.get("items", [])
-
     # Build parent-child mapping
     children_map = {}  # parentId -> [childIds]
     parent_map = {}  # childId -> parentId
@@ -565,21 +1087,60 @@ def build_workspace_hierarchy(
     return {"roots": roots, "map": node_map}
 
 
+# Display names for API permission values
+PERMISSION_DISPLAY_NAMES = {
+    "none": "None",
+    "read": "Read",
+    "comment": "Comment",
+    "write": "Write",
+    "full": "Full",
+}
+
+
+@functools.lru_cache(maxsize=32)
 def format_permission(permission: str) -> str:
-    """Format a permission value for display."""
-    permission_map = {
-        "none": "None",
-        "read": "Read",
-        "comment": "Comment",
-        "write": "Write",
-        "full": "Full",
-    }
-    return permission_map.get(permission, permission)
+    """Format a permission value for display (memoized, the value set is tiny)."""
+    return PERMISSION_DISPLAY_NAMES.get(permission, permission)
+
+
+# '..' indentation prefix per hierarchy depth, grown on demand by get_indent()
+_indent_cache: list = [".." * depth for depth in range(32)]
+
+
+def get_indent(depth: int) -> str:
+    """
+    Get the '..' indentation prefix for a hierarchy depth.
+
+    Args:
+        depth: Depth level in hierarchy
+
+    Returns:
+        '..' repeated depth times (cached per depth)
+    """
+    while depth >= len(_indent_cache):
+        _indent_cache.append(".." * len(_indent_cache))
+    return _indent_cache[depth]
+
+
+# ANSI escape codes by color name
+ANSI_COLOR_CODES = {
+    "red": "\033[91m",
+    "green": "\033[92m",
+    "yellow": "\033[93m",
+    "blue": "\033[94m",
+    "magenta": "\033[95m",
+    "cyan": "\033[96m",
+    "white": "\033[97m",
+    "orange": "\033[38;5;208m",  # 256-color orange
+    "reset": "\033[0m",
+}
 
 
+@functools.lru_cache(maxsize=4096)
 def colorize(text: str, color: str) -> str:
     """
     Apply ANSI color codes to text.
+    Results are memoized, as headers and suffixes are colorized repeatedly.
 
     Args:
         text: Text to colorize
@@ -588,37 +1149,65 @@ def colorize(text: str, color: str) -> str:
     Returns:
         Text wrapped in ANSI color codes
     """
-    color_map = {
-        "red": "\033[91m",
-        "green": "\033[92m",
-        "yellow": "\033[93m",
-        "blue": "\033[94m",
-        "magenta": "\033[95m",
-        "cyan": "\033[96m",
-        "white": "\033[97m",
-        "orange": "\033[38;5;208m",  # 256-color orange
-        "reset": "\033[0m",
-    }
-
-    color_code = color_map.get(color.lower(), "")
-    reset_code = color_map["reset"]
+    color_code = ANSI_COLOR_CODES.get(color.lower(), "")
+    reset_code = ANSI_COLOR_CODES["reset"]
 
     if color_code:
         return f"{color_code}{text}{reset_code}"
     return text
 
 
-def get_team_info(verify_ssl: bool = True) -> Dict[str, Any]:
+# Red " (Wrong)" marker appended to invalid lines, colorized once at import
+WRONG_SUFFIX = colorize(" (Wrong)", "red")
+
+
+def format_wrong(text: str, color: Optional[str] = None) -> str:
+    """
+    Render an invalid line: text in its color followed by a red ' (Wrong)',
+    or the whole line in red when there is no color. Built as a single string
+    (same result as colorize(text, color) + WRONG_SUFFIX).
+
+    Args:
+        text: Line text
+        color: Color name for the line text (None for uncolored)
+
+    Returns:
+        Line with the (Wrong) marker
+    """
+    reset_code = ANSI_COLOR_CODES["reset"]
+    if not color:
+        return f"{ANSI_COLOR_CODES['red']}{text} (Wrong){reset_code}"
+    color_code = ANSI_COLOR_CODES.get(color.lower(), "")
+    if color_code:
+        return f"{color_code}{text}{reset_code}{WRONG_SUFFIX}"
+    return f"{text}{WRONG_SUFFIX}"
+
+
+def get_team_info(
+    verify_ssl: bool = True, refresh: bool = False, use_cache: bool = False
+) -> Dict[str, Any]:
     """
     Get team information including license seat data.
+    The response is cached for the lifetime of the process.
 
     Args:
         verify_ssl: Whether to verify SSL certificates (default: True)
+        refresh: If True, bypass the cached response and query the API again
+        use_cache: Whether to go through the on-disk response cache (default: False)
 
     Returns:
         Team information dictionary containing seats data
     """
-    return make_api_request("/api/team", verify_ssl=verify_ssl)
+    global _team_info
+
+    if _team_info is None or refresh:
+        if use_cache:
+            _team_info = cached_api_request(
+                "/api/team", verify_ssl=verify_ssl, refresh=refresh
+            )
+        else:
+            _team_info = make_api_request("/api/team", verify_ssl=verify_ssl)
+    return _team_info
 
 
 def get_unique_members_by_prefix(
@@ -657,6 +1246,69 @@ def get_unique_members_by_prefix(
     return unique_users
 
 
+def classify_group_members(
+    rules: Dict[str, Tuple[str, Optional[str]]]
+) -> Dict[str, set]:
+    """
+    Collect unique user IDs for several group name patterns in a single pass over the group registry.
+
+    Args:
+        rules: Mapping of label -> (prefix, exclude_suffix), e.g.
+               {'okr': ('SP_OKR_', None), 'prodmgt': ('SP_ProdMgt_', '_C_U')}
+
+    Returns:
+        Mapping of label -> set of unique user IDs across groups matching that rule
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    members = {label: set() for label in rules}
+    all_prefixes = tuple({prefix for prefix, _ in rules.values()})
+
+    for group in _group_registry.values():
+        group_name = group.get("name", "")
+
+        # Most groups match no rule - reject them with a single C-level check
+        if not group_name.startswith(all_prefixes):
+            continue
+
+        for label, (prefix, exclude_suffix) in rules.items():
+            if not group_name.startswith(prefix):
+                continue
+            if exclude_suffix and group_name.endswith(exclude_suffix):
+                continue
+            members[label].update(group.get("userIds", []))
+
+    return members
+
+
+def user_ids_to_mask(user_ids) -> int:
+    """
+    Convert user IDs to an integer bitmask for fast cohort set algebra.
+
+    Masks built from the same registry can be combined with &, | and & ~,
+    and counted with int.bit_count(). IDs missing from the user registry
+    (e.g. stale group members) are assigned new bit positions.
+
+    Args:
+        user_ids: Iterable of user IDs
+
+    Returns:
+        Integer with one bit set per user ID
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    bits = bytearray((len(_user_index) + 7) // 8)
+    for user_id in user_ids:
+        index = _user_index.setdefault(user_id, len(_user_index))
+        if index >= len(bits) * 8:
+            bits.extend(bytes(index // 8 + 1 - len(bits)))
+        bits[index >> 3] |= 1 << (index & 7)
+
+    return int.from_bytes(bits, "little")
+
+
 def get_groups_matching_pattern(
     prefix: str, exclude_suffix: Optional[str] = None
 ) -> list:
@@ -691,6 +1343,45 @@ def get_groups_matching_pattern(
     return matching_groups
 
 
+# Groups whose contributors are reported: all SP_OKR_ groups, and SP_ProdMgt_ groups except *_C_U
+CONTRIBUTOR_GROUP_PATTERNS = (("SP_OKR_", None), ("SP_ProdMgt_", "_C_U"))
+
+
+def get_groups_matching_patterns(patterns) -> list:
+    """
+    Get the user groups matching any of several prefix patterns in a single pass
+    over the group registry.
+
+    Args:
+        patterns: Sequence of (prefix, exclude_suffix) pairs, e.g. CONTRIBUTOR_GROUP_PATTERNS
+
+    Returns:
+        List of group dictionaries, ordered pattern by pattern (same result as
+        concatenating get_groups_matching_pattern() for each pattern)
+    """
+    if not _registries_loaded:
+        load_registries()
+
+    matches = [[] for _ in patterns]
+    all_prefixes = tuple(prefix for prefix, _ in patterns)
+
+    for group in _group_registry.values():
+        group_name = group.get("name", "")
+
+        # Most groups match no pattern - reject them with a single C-level check
+        if not group_name.startswith(all_prefixes):
+            continue
+
+        for matching_groups, (prefix, exclude_suffix) in zip(matches, patterns):
+            if not group_name.startswith(prefix):
+                continue
+            if exclude_suffix and group_name.endswith(exclude_suffix):
+                continue
+            matching_groups.append(group)
+
+    return [group for matching_groups in matches for group in matching_groups]
+
+
 def get_all_group_contributors() -> Dict[str, Dict[str, Any]]:
     """
     Get all users with 'contributor' role across SP_OKR_ and SP_ProdMgt_ groups (excluding *_C_U).
@@ -705,14 +1396,8 @@ def get_all_group_contributors() -> Dict[str, Dict[str, Any]]:
     if not _registries_loaded:
         load_registries()
 
-    # Get all SP_OKR_ groups
-    okr_groups = get_groups_by_prefix("SP_OKR_")
-
-    # Get all SP_ProdMgt_ groups excluding *_C_U
-    prodmgt_groups = get_groups_matching_pattern("SP_ProdMgt_", exclude_suffix="_C_U")
-
-    # Combine both lists
-    all_groups = okr_groups + prodmgt_groups
+    # All SP_OKR_ groups and SP_ProdMgt_ groups excluding *_C_U, in one registry pass
+    all_groups = get_groups_matching_patterns(CONTRIBUTOR_GROUP_PATTERNS)
 
     # Dictionary to track contributors: user_id -> {'name': str, 'groups': [group_names]}
     contributors_data = {}
@@ -749,20 +1434,13 @@ def get_users_not_in_groups(role: Optional[str] = None) -> set:
         load_registries()
 
     # Collect all user IDs that are in at least one group
-    users_in_groups = set()
-    for group in _group_registry.values():
-        user_ids = group.get("userIds", [])
-        users_in_groups.update(user_ids)
-
-    # Find users not in any group
-    users_not_in_groups = set()
-    for user_id, user in _user_registry.items():
-        if user_id not in users_in_groups:
-            # Apply role filter if specified
-            if role is None or user.get("role") == role:
-                users_not_in_groups.add(user_id)
+    users_in_groups = set().union(
+        *(group.get("userIds", []) for group in _group_registry.values())
+    )
 
-    return users_not_in_groups
+    # Find users not in any group, restricted to the role index if a role is given
+    candidates = _user_registry.keys() if role is None else get_users_by_role(role)
+    return candidates - users_in_groups
 
 
 def get_users_not_in_specific_groups(
@@ -782,31 +1460,15 @@ def get_users_not_in_specific_groups(
     if not _registries_loaded:
         load_registries()
 
-    # Collect all user IDs that are in groups matching the prefixes
-    users_in_matching_groups = set()
-    for group in _group_registry.values():
-        group_name = group.get("name", "")
-
-        # Check if group matches any of the prefixes
-        matches_prefix = any(group_name.startswith(prefix) for prefix in prefixes)
-
-        if matches_prefix:
-            # Check if we should exclude this group by suffix
-            if exclude_suffix and group_name.endswith(exclude_suffix):
-                continue
-
-            user_ids = group.get("userIds", [])
-            users_in_matching_groups.update(user_ids)
-
-    # Find users not in matching groups
-    users_not_in_matching_groups = set()
-    for user_id, user in _user_registry.items():
-        if user_id not in users_in_matching_groups:
-            # Apply role filter if specified
-            if role is None or user.get("role") == role:
-                users_not_in_matching_groups.add(user_id)
+    # Collect all user IDs that are in groups matching the prefixes (one pass over groups)
+    matched = classify_group_members(
+        {prefix: (prefix, exclude_suffix) for prefix in prefixes}
+    )
+    users_in_matching_groups = set().union(*matched.values())
 
-    return users_not_in_matching_groups
+    # Users not in matching groups, restricted to the role index if a role is given
+    candidates = _user_registry.keys() if role is None else get_users_by_role(role)
+    return candidates - users_in_matching_groups
 
 
 def build_folder_hierarchy(workspaces: list, verify_ssl: bool = True) -> Dict[str, Any]:
@@ -824,34 +1486,23 @@ def build_folder_hierarchy(workspaces: list, verify_ssl: bool = True) -> Dict[st
     """
     # Fetch all workspace groups (folders) with basic info
     try:
-        response = make_api_request(
+        folders_basic = fetch_all_pages(
             "/api/workspaces/groups/search",
-            method="POST",
             data={},
             verify_ssl=verify_ssl,
         )
-        folders_basic = response.get("items", [])
     except Exception as e:
         print(f"Warning: Could not fetch workspace groups: {e}")
         folders_basic = []
 
-    # Fetch all folders with embedded data (permissions and workspaces) in one batch request
+    # Fetch all folders with embedded data (permissions and workspaces) in a single list request
     folder_ids = [f["id"] for f in folders_basic]
     folders_with_embed = {}
 
     if folder_ids:
         try:
-            # Use list endpoint to get all folders with embedded data in one call
-            list_response = make_api_request(
-                "/api/workspaces/groups/list",
-                method="POST",
-                data=folder_ids,
-                verify_ssl=verify_ssl,
-            )
-            # Response is an array of folders with embedded data
-            for folder in list_response:
-                if folder:  # Can be null for inaccessible folders
-                    folders_with_embed[folder["id"]] = folder
+            for folder in fetch_folders_by_ids(folder_ids, verify_ssl=verify_ssl):
+                folders_with_embed[folder["id"]] = folder
         except Exception as e:
             print(f"Warning: Could not fetch folder details: {e}")
 
@@ -867,6 +1518,13 @@ def build_folder_hierarchy(workspaces: list, verify_ssl: bool = True) -> Dict[st
         for ws in folder_workspaces:
             workspace_to_folder[ws["id"]] = folder_id
 
+    # Invert once (keeping workspace order) so each folder node gets its workspaces
+    # without scanning every workspace
+    folder_workspace_ids = {}  # folder_id -> [workspace_ids]
+    for ws_id, f_id in workspace_to_folder.items():
+        if ws_id in workspace_map:
+            folder_workspace_ids.setdefault(f_id, []).append(ws_id)
+
     # Build folder parent-child relationships (folders can be nested)
     folder_children = {}  # folder_id -> [child_folder_ids]
     folder_parent = {}  # folder_id -> parent_folder_id
@@ -911,11 +1569,8 @@ def build_folder_hierarchy(workspaces: list, verify_ssl: bool = True) -> Dict[st
         }
 
         # Add workspaces in this folder
-        for ws_id, f_id in workspace_to_folder.items():
-            if f_id == folder_id and ws_id in workspace_map:
-                node["workspaces"].append(
-                    {"workspace": workspace_map[ws_id], "children": []}
-                )
+        for ws_id in folder_workspace_ids.get(folder_id, []):
+            node["workspaces"].append({"workspace": workspace_map[ws_id], "children": []})
 
         # Add subfolders recursively
         if folder_id in folder_children:
@@ -951,7 +1606,11 @@ def get_field_id_by_name(field_name: str, registries=None, verify_ssl=True) -> s
     """
     # Use the correct endpoint for searching fields
     fields_response = make_api_request(
-        "/api/fields/search", method="POST", data={}, verify_ssl=verify_ssl
+        "/api/fields/search",
+        method="POST",
+        data={},
+        verify_ssl=verify_ssl,
+        read_only=True,
     )
     fields = (
         fields_response.get("items", [])
@@ -977,7 +1636,11 @@ def get_field_by_name(field_name: str, verify_ssl=True):
         Full field object with all configuration, or None if not found.
     """
     fields_response = make_api_request(
-        "/api/fields/search", method="POST", data={}, verify_ssl=verify_ssl
+        "/api/fields/search",
+        method="POST",
+        data={},
+        verify_ssl=verify_ssl,
+        read_only=True,
     )
     fields = (
         fields_response.get("items", [])
@@ -1217,38 +1880,27 @@ def get_user_workspace_groups(user_id: str, verify_ssl: bool = True) -> list:
     """
     # Fetch all workspace groups (folders) with basic info
     try:
-        response = make_api_request(
+        folders_basic = fetch_all_pages(
             "/api/workspaces/groups/search",
-            method="POST",
             data={},
             verify_ssl=verify_ssl,
         )
-        folders_basic = response.get("items", [])
     except Exception as e:
         return []
 
-    # Fetch all folders with embedded data (permissions) in one batch request
+    # Fetch all folders with embedded data (permissions) in a single list request
     folder_ids = [f["id"] for f in folders_basic]
     user_folders = []
 
     if folder_ids:
         try:
-            # Use list endpoint to get all folders with embedded data in one call
-            list_response = make_api_request(
-                "/api/workspaces/groups/list",
-                method="POST",
-                data=folder_ids,
-                verify_ssl=verify_ssl,
-            )
-            # Response is an array of folders with embedded data
-            for folder in list_response:
-                if folder:  # Can be null for inaccessible folders
-                    embedded = folder.get("_embedded", {})
-                    user_permissions = embedded.get("permissions", {})
-
-                    # Check if user has direct permission on this folder
-                    if user_id in user_permissions:
-                        user_folders.append(folder)
+            for folder in fetch_folders_by_ids(folder_ids, verify_ssl=verify_ssl):
+                embedded = folder.get("_embedded", {})
+                user_permissions = embedded.get("permissions", {})
+
+                # Check if user has direct permission on this folder
+                if user_id in user_permissions:
+                    user_folders.append(folder)
         except Exception as e:
             pass
 